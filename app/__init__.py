@@ -30,12 +30,32 @@ def create_app():
     from app.routes.donations import donations_bp
     from app.routes.distributions import distributions_bp
     from app.routes.dashboard import dashboard_bp
+    from app.routes.sync import sync_bp
+    from app.routes.jobs import jobs_bp
+    from app.routes.audit import audit_bp
+    from app.routes.duplicates import duplicates_bp
     
     app.register_blueprint(auth_bp)
     app.register_blueprint(families_bp)
     app.register_blueprint(donations_bp)
     app.register_blueprint(distributions_bp)
     app.register_blueprint(dashboard_bp)
+    app.register_blueprint(sync_bp)
+    app.register_blueprint(jobs_bp)
+    app.register_blueprint(audit_bp)
+    app.register_blueprint(duplicates_bp)
+    
+    # Controle de admissão: limite de concorrência, prioridade e
+    # statement_timeout por classe de rota (veja app/utils/admission.py)
+    from app.utils.admission import AdmissionControl, ROUTE_CLASSES, ENDPOINT_CLASSES
+    
+    AdmissionControl(ROUTE_CLASSES, ENDPOINT_CLASSES).init_app(app)
+    
+    # Comandos de manutenção (flask --app "app:create_app()" <comando>)
+    from app.utils.partitions import ensure_partitions_command, archive_partitions_command
+    
+    app.cli.add_command(ensure_partitions_command)
+    app.cli.add_command(archive_partitions_command)
     
     # Rota de health check
     @app.route('/health')
@@ -52,7 +72,11 @@ def create_app():
                 'families': '/api/families',
                 'donations': '/api/donations',
                 'distributions': '/api/distributions',
-                'dashboard': '/api/dashboard'
+                'dashboard': '/api/dashboard',
+                'sync': '/api/sync',
+                'jobs': '/api/jobs',
+                'audit': '/api/audit',
+                'duplicates': '/api/duplicates'
             }
         }, 200
     
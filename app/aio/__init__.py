@@ -0,0 +1,94 @@
+from quart import Quart
+from quart_cors import cors
+from dotenv import load_dotenv
+import os
+
+# Carregar variáveis de ambiente
+load_dotenv()
+
+def create_async_app():
+    """Factory function para criar a aplicação assíncrona (ASGI).
+
+    Serve as mesmas rotas e contratos JSON de `create_app`, usando Quart
+    e um pool asyncpg próprio em vez de uma conexão psycopg2 por requisição.
+    """
+    app = Quart(__name__)
+    
+    # Configurações
+    app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
+    
+    # Configurar CORS
+    frontend_url = os.getenv('FRONTEND_URL', 'http://localhost:5173')
+    app = cors(
+        app,
+        allow_origin=[frontend_url, "http://localhost:5173", "http://localhost:3000"],
+        allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+        allow_headers=["Content-Type", "Authorization"],
+        allow_credentials=True
+    )
+    
+    # Pool de conexões: aberto quando o servidor sobe, fechado ao encerrar
+    from app.aio.database import init_pool, close_pool
+    from app.aio.routes.dashboard import broker
+    
+    @app.before_serving
+    async def startup():
+        await init_pool()
+    
+    @app.after_serving
+    async def shutdown():
+        await broker.close()
+        await close_pool()
+    
+    # Registrar blueprints
+    from app.aio.routes.auth import auth_bp
+    from app.aio.routes.families import families_bp
+    from app.aio.routes.donations import donations_bp
+    from app.aio.routes.distributions import distributions_bp
+    from app.aio.routes.dashboard import dashboard_bp
+    from app.aio.routes.sync import sync_bp
+    from app.aio.routes.jobs import jobs_bp
+    from app.aio.routes.audit import audit_bp
+    from app.aio.routes.duplicates import duplicates_bp
+    
+    app.register_blueprint(auth_bp)
+    app.register_blueprint(families_bp)
+    app.register_blueprint(donations_bp)
+    app.register_blueprint(distributions_bp)
+    app.register_blueprint(dashboard_bp)
+    app.register_blueprint(sync_bp)
+    app.register_blueprint(jobs_bp)
+    app.register_blueprint(audit_bp)
+    app.register_blueprint(duplicates_bp)
+    
+    # Controle de admissão: limite de concorrência, prioridade e
+    # statement_timeout por classe de rota (veja app/utils/admission.py)
+    from app.utils.admission import ROUTE_CLASSES, ENDPOINT_CLASSES
+    from app.aio.admission import AsyncAdmissionControl
+    
+    AsyncAdmissionControl(ROUTE_CLASSES, ENDPOINT_CLASSES).init_app(app)
+    
+    # Rota de health check
+    @app.route('/health')
+    async def health_check():
+        return {'status': 'ok', 'message': 'Backend de Cestas Básicas está funcionando!'}, 200
+    
+    @app.route('/')
+    async def index():
+        return {
+            'message': 'API do Sistema de Gerenciamento de Cestas Básicas',
+            'version': '1.0.0',
+            'endpoints': {
+                'auth': '/api/auth',
+                'families': '/api/families',
+                'donations': '/api/donations',
+                'distributions': '/api/distributions',
+                'dashboard': '/api/dashboard',
+                'sync': '/api/sync',
+                'jobs': '/api/jobs',
+                'audit': '/api/audit',
+                'duplicates': '/api/duplicates'
+            }
+        }, 200
+    
+    return app
@@ -0,0 +1,73 @@
+import asyncio
+import os
+from quart import g, request, jsonify
+from app.utils.admission import AdmissionControl, ADMISSION_EXEMPT
+from app.aio.database import ASYNC_POOL_MAX_SIZE
+
+# Requisições simultâneas no modo assíncrono (por processo). O padrão é o
+# tamanho do pool: com mais requisições admitidas que conexões, listagens
+# lentas ocupariam todas as conexões e o login esperaria na fila do pool,
+# mesmo tendo sido admitido.
+ASYNC_ADMISSION_CAPACITY = int(os.getenv('ASYNC_ADMISSION_CAPACITY', ASYNC_POOL_MAX_SIZE))
+
+class AsyncAdmissionControl(AdmissionControl):
+    """Controle de admissão do modo assíncrono.
+
+    Mesmas classes e regras de `AdmissionControl`, mas a espera por vaga
+    usa um asyncio.Condition: a requisição aguarda sem bloquear o event loop.
+    """
+
+    def __init__(self, classes, endpoints, capacity=ASYNC_ADMISSION_CAPACITY):
+        super().__init__(classes, endpoints, capacity)
+        self.condition = None
+
+    async def acquire(self, name, wait=None):
+        """Ocupa uma vaga da classe; retorna False se não houver vaga a tempo."""
+        if self.condition is None:
+            # Criado dentro do event loop do servidor
+            self.condition = asyncio.Condition()
+        wait = self.classes[name]['wait'] if wait is None else wait
+        async with self.condition:
+            if not self._has_room(name):
+                if wait <= 0:
+                    return False
+                try:
+                    await asyncio.wait_for(self.condition.wait_for(lambda: self._has_room(name)), wait)
+                except asyncio.TimeoutError:
+                    return False
+            self.running[name] += 1
+            self.total += 1
+            return True
+
+    async def release(self, name):
+        """Libera a vaga ocupada por `acquire`."""
+        async with self.condition:
+            self.running[name] -= 1
+            self.total -= 1
+            self.condition.notify_all()
+
+    def overloaded(self, name):
+        """Resposta de recusa (503) para a classe."""
+        retry_after = self.classes[name]['retry_after']
+        response = jsonify({'error': 'Servidor sobrecarregado. Tente novamente em instantes.'})
+        return response, 503, {'Retry-After': str(retry_after)}
+
+    def init_app(self, app):
+        """Aplica o controle de admissão às rotas da aplicação assíncrona."""
+        @app.before_request
+        async def admit():
+            if request.method == 'OPTIONS' or request.endpoint in (None, *ADMISSION_EXEMPT):
+                return None
+            name = self.classify(request.endpoint, request.method)
+            if not await self.acquire(name):
+                return self.overloaded(name)
+            g.route_class = name
+            # Aplicado por get_db_connection em cada conexão emprestada
+            g.statement_timeout = self.classes[name]['statement_timeout']
+            return None
+
+        @app.teardown_request
+        async def release(exc):
+            name = g.pop('route_class', None)
+            if name:
+                await self.release(name)
@@ -0,0 +1,30 @@
+from functools import wraps
+from quart import request, jsonify
+from app.utils.auth import decode_token
+
+def token_required(f):
+    """Decorator assíncrono para proteger rotas que requerem autenticação."""
+    @wraps(f)
+    async def decorated(*args, **kwargs):
+        token = None
+        
+        # Verificar se o token está no header Authorization
+        if 'Authorization' in request.headers:
+            auth_header = request.headers['Authorization']
+            try:
+                token = auth_header.split(' ')[1]  # Bearer <token>
+            except IndexError:
+                return jsonify({'error': 'Token inválido'}), 401
+        
+        if not token:
+            return jsonify({'error': 'Token não fornecido'}), 401
+        
+        # Decodificar o token
+        payload = decode_token(token)
+        if not payload:
+            return jsonify({'error': 'Token inválido ou expirado'}), 401
+        
+        # Passar os dados do usuário para a função
+        return await f(payload, *args, **kwargs)
+    
+    return decorated
@@ -0,0 +1,42 @@
+import os
+import asyncpg
+from contextlib import asynccontextmanager
+from quart import g, has_app_context
+from app.utils.database import DATABASE_URL, DB_POOL_TIMEOUT, DB_STATEMENT_TIMEOUT
+
+# Tamanho do pool de conexões do modo assíncrono (por processo)
+ASYNC_POOL_MIN_SIZE = int(os.getenv('ASYNC_POOL_MIN_SIZE', 2))
+ASYNC_POOL_MAX_SIZE = int(os.getenv('ASYNC_POOL_MAX_SIZE', 20))
+
+_pool = None
+
+async def init_pool():
+    """Cria o pool de conexões assíncrono."""
+    global _pool
+    _pool = await asyncpg.create_pool(
+        DATABASE_URL,
+        min_size=ASYNC_POOL_MIN_SIZE,
+        max_size=ASYNC_POOL_MAX_SIZE
+    )
+
+async def close_pool():
+    """Fecha o pool de conexões assíncrono."""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+@asynccontextmanager
+async def get_db_connection():
+    """Context manager assíncrono: conexão do pool dentro de uma transação.
+
+    O statement_timeout da classe da rota vale só para esta transação.
+    Como no modo síncrono, a espera por uma conexão livre é limitada a
+    DB_POOL_TIMEOUT segundos.
+    """
+    timeout = g.get('statement_timeout', DB_STATEMENT_TIMEOUT) if has_app_context() else DB_STATEMENT_TIMEOUT
+    async with _pool.acquire(timeout=DB_POOL_TIMEOUT) as conn:
+        async with conn.transaction():
+            if timeout:
+                await conn.execute(f"SET LOCAL statement_timeout = {int(timeout)}")
+            yield conn
@@ -0,0 +1,106 @@
+import asyncio
+import json
+import asyncpg
+from app.utils.database import DATABASE_URL
+from app.utils.events import DASHBOARD_CHANNEL
+from app.utils.queries import QUERIES
+
+async def notify_change(conn, kind, data=None):
+    """Publica uma alteração no canal do dashboard (entregue no commit)."""
+    payload = json.dumps({'type': kind, 'data': data})
+    await conn.execute(QUERIES['notify_change'], DASHBOARD_CHANNEL, payload)
+
+class AsyncDashboardBroker:
+    """Versão assíncrona do DashboardBroker: um LISTEN por processo.
+
+    As notificações chegam pelo callback, antes da resposta da consulta do
+    token em andamento, então valem as mesmas regras para o id dos eventos.
+    """
+
+    def __init__(self, compute_stats, debounce=0.2, queue_size=100):
+        self.compute_stats = compute_stats
+        self.debounce = debounce
+        self.queue_size = queue_size
+        self.latest_stats = None
+        self.latest_token = None
+        self._subscribers = set()
+        self._refresh_pending = False
+        self._task = None
+        self._conn = None
+        self._conn_lock = asyncio.Lock()
+
+    def subscribe(self):
+        """Registra um novo inscrito e devolve sua fila de eventos."""
+        subscriber = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(subscriber)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._listen())
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        self._subscribers.discard(subscriber)
+
+    def publish(self, event, data, event_id=None):
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber.put_nowait((event, data, event_id))
+            except asyncio.QueueFull:
+                # Cliente lento: ele recebe as estatísticas completas no próximo evento
+                pass
+
+    async def _refresh_stats(self):
+        async with self._conn_lock:
+            token = await self._conn.fetchval(QUERIES['sync_token'])
+            stats = await self.compute_stats(self._conn)
+        self.latest_stats, self.latest_token = stats, token.isoformat()
+        self.publish('stats', stats, self.latest_token)
+
+    async def _refresh_later(self):
+        # Agrupar as notificações que chegarem logo em seguida
+        await asyncio.sleep(self.debounce)
+        self._refresh_pending = False
+        await self._refresh_stats()
+
+    def _on_notification(self, conn, pid, channel, payload):
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            return
+        if message.get('type') == 'distribution' and message.get('data'):
+            # Token anterior: o evento de estatísticas seguinte traz o novo
+            self.publish('distribution', message['data'], self.latest_token)
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            asyncio.get_running_loop().create_task(self._refresh_later())
+
+    async def _listen(self):
+        backoff = 1
+        while True:
+            try:
+                self._conn = await asyncpg.connect(DATABASE_URL)
+                await self._conn.add_listener(DASHBOARD_CHANNEL, self._on_notification)
+
+                # Eventos podem ter sido perdidos enquanto estávamos desconectados
+                await self._refresh_stats()
+                backoff = 1
+
+                while True:
+                    await asyncio.sleep(60)
+                    # Confirmar que a conexão continua viva
+                    async with self._conn_lock:
+                        await self._conn.fetchval("SELECT 1")
+            except asyncio.CancelledError:
+                if self._conn is not None:
+                    await self._conn.close()
+                raise
+            except Exception as e:
+                print(f"✗ Listener do dashboard desconectado: {e}")
+                if self._conn is not None and not self._conn.is_closed():
+                    self._conn.terminate()
+                self._refresh_pending = False
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
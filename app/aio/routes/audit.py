@@ -0,0 +1,35 @@
+import json
+from quart import Blueprint, request, jsonify
+from app.aio.database import get_db_connection
+from app.utils.queries import QUERIES
+from app.aio.auth import token_required
+from app.utils.audit import parse_audit_filters
+from app.utils.serializers import serialize_audit
+
+audit_bp = Blueprint('audit', __name__, url_prefix='/api/audit')
+
+@audit_bp.route('', methods=['GET'])
+@token_required
+async def get_audit(current_user):
+    """Lista a trilha de auditoria, do mais recente para o mais antigo."""
+    try:
+        query, params, limit = parse_audit_filters(request.args)
+    except ValueError as e:
+        return jsonify({'error': f'Filtro inválido: {str(e)}'}), 400
+    
+    try:
+        async with get_db_connection() as conn:
+            entries = await conn.fetch(QUERIES[query], *params)
+        
+        # asyncpg devolve JSONB como texto
+        entries = [
+            dict(entry, details=json.loads(entry['details']) if entry['details'] else None)
+            for entry in entries
+        ]
+        return jsonify({
+            'entries': [serialize_audit(entry) for entry in entries],
+            'nextBefore': entries[-1]['id'] if len(entries) == limit else None
+        }), 200
+    
+    except Exception as e:
+        return jsonify({'error': f'Erro ao buscar auditoria: {str(e)}'}), 500
@@ -0,0 +1,155 @@
+import asyncio
+from quart import Blueprint, request, jsonify, make_response
+from app.aio.database import get_db_connection
+from app.utils.queries import QUERIES
+from app.aio.auth import token_required
+from app.aio.events import AsyncDashboardBroker
+from app.utils.events import HEARTBEAT_INTERVAL, DASHBOARD_RESUME_LIMIT, format_event, resume_event_id
+from app.utils.auth import decode_token
+from app.utils.serializers import serialize_distribution
+from datetime import datetime
+
+dashboard_bp = Blueprint('dashboard', __name__, url_prefix='/api/dashboard')
+
+async def compute_stats(conn):
+    """Calcula as estatísticas gerais exibidas no dashboard."""
+    # Total de famílias
+    total_families = await conn.fetchval(QUERIES['families_count'])
+    
+    # Total de doações (cestas recebidas)
+    total_donations = await conn.fetchval(QUERIES['donations_total'])
+    
+    # Total de distribuições (cestas distribuídas)
+    total_distributions = await conn.fetchval(QUERIES['distributions_total'])
+    
+    # Cestas disponíveis
+    available_baskets = total_donations - total_distributions
+    
+    # Últimas distribuições
+    recent_distributions = await conn.fetch(QUERIES['distributions_recent'])
+    
+    return {
+        'totalFamilies': total_families,
+        'totalDonations': total_donations,
+        'totalDistributions': total_distributions,
+        'availableBaskets': available_baskets,
+        'recentDistributions': [
+            {
+                'id': str(dist['id']),
+                'familyName': dist['family_name'],
+                'pickupPersonName': dist['pickup_person_name'],
+                'quantity': dist['quantity'],
+                'date': dist['date'].isoformat(),
+                'createdAt': dist['created_at'].isoformat()
+            }
+            for dist in recent_distributions
+        ]
+    }
+
+broker = AsyncDashboardBroker(compute_stats)
+
+@dashboard_bp.route('/stats', methods=['GET'])
+@token_required
+async def get_stats(current_user):
+    """Retorna estatísticas gerais do sistema."""
+    try:
+        async with get_db_connection() as conn:
+            stats = await compute_stats(conn)
+        
+        return jsonify(stats), 200
+    
+    except Exception as e:
+        return jsonify({'error': f'Erro ao buscar estatísticas: {str(e)}'}), 500
+
+@dashboard_bp.route('/queries', methods=['GET'])
+@token_required
+async def get_queries(current_user):
+    """Retorna os planos das consultas preparadas na conexão do pool.
+
+    O asyncpg prepara as consultas por conexão sem passar pelo registro de
+    `app/utils/queries.py`, então não há contadores de PREPARE/EXECUTE: só
+    os planos genéricos e específicos de pg_prepared_statements (Postgres
+    14+), identificados pelo texto da consulta.
+    """
+    try:
+        async with get_db_connection() as conn:
+            if conn.get_server_version() >= (14,):
+                rows = await conn.fetch("SELECT statement, generic_plans, custom_plans FROM pg_prepared_statements")
+            else:
+                rows = []
+        
+        names = {text.strip(): name for name, text in QUERIES.items()}
+        stats = {}
+        for row in rows:
+            name = names.get(row['statement'].strip())
+            if name:
+                stats[name] = {'genericPlans': row['generic_plans'], 'customPlans': row['custom_plans']}
+        
+        return jsonify(dict(sorted(stats.items()))), 200
+    
+    except Exception as e:
+        return jsonify({'error': f'Erro ao buscar estatísticas das consultas: {str(e)}'}), 500
+
+@dashboard_bp.route('/stream', methods=['GET'])
+async def stream_stats():
+    """Envia as estatísticas e novas distribuições via Server-Sent Events."""
+    token = request.args.get('token')
+    if 'Authorization' in request.headers:
+        try:
+            token = request.headers['Authorization'].split(' ')[1]
+        except IndexError:
+            return jsonify({'error': 'Token inválido'}), 401
+    
+    if not token:
+        return jsonify({'error': 'Token não fornecido'}), 401
+    
+    if not decode_token(token):
+        return jsonify({'error': 'Token inválido ou expirado'}), 401
+    
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('lastEventId')
+    try:
+        resume_from = datetime.fromisoformat(last_event_id) if last_event_id else None
+    except ValueError:
+        resume_from = None
+    
+    # Inscrever antes de buscar as perdidas (veja a versão síncrona)
+    subscriber = broker.subscribe()
+    
+    # Distribuições criadas enquanto o cliente estava desconectado
+    missed, missed_id = [], None
+    if resume_from:
+        try:
+            async with get_db_connection() as conn:
+                token = await conn.fetchval(QUERIES['sync_token'])
+                rows = await conn.fetch(QUERIES['distributions_created_since'], resume_from, DASHBOARD_RESUME_LIMIT)
+            missed = [serialize_distribution(dist) for dist in rows]
+            missed_id = resume_event_id(token, rows)
+        except Exception as e:
+            broker.unsubscribe(subscriber)
+            return jsonify({'error': f'Erro ao retomar eventos: {str(e)}'}), 500
+    
+    async def generate():
+        try:
+            yield b"retry: 5000\n\n"
+            for dist in missed:
+                yield format_event('distribution', dist, missed_id).encode()
+            if broker.latest_stats is not None:
+                yield format_event('stats', broker.latest_stats, broker.latest_token).encode()
+            
+            while True:
+                try:
+                    event, data, event_id = await asyncio.wait_for(subscriber.get(), HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield b": heartbeat\n\n"
+                    continue
+                yield format_event(event, data, event_id).encode()
+        finally:
+            broker.unsubscribe(subscriber)
+    
+    response = await make_response(generate(), {
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+    response.timeout = None
+    return response
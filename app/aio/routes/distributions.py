@@ -0,0 +1,94 @@
+from quart import Blueprint, request, jsonify
+from app.aio.database import get_db_connection
+from app.utils.queries import QUERIES
+from app.aio.auth import token_required
+from app.aio.events import notify_change
+from app.utils.audit import record_audit, audit_fields
+from app.utils.partitions import parse_created_range
+from app.utils.serializers import serialize_distribution
+from datetime import datetime
+
+distributions_bp = Blueprint('distributions', __name__, url_prefix='/api/distributions')
+
+@distributions_bp.route('', methods=['GET'])
+@token_required
+async def get_distributions(current_user):
+    """Lista todas as distribuições (opcionalmente entre as datas `from` e `to`)."""
+    try:
+        created_range = parse_created_range(request.args)
+    except ValueError:
+        return jsonify({'error': 'Período inválido'}), 400
+    
+    try:
+        async with get_db_connection() as conn:
+            if created_range:
+                distributions = await conn.fetch(QUERIES['distribution_list_between'], *created_range)
+            else:
+                distributions = await conn.fetch(QUERIES['distribution_list'])
+        
+        return jsonify([serialize_distribution(dist) for dist in distributions]), 200
+    
+    except Exception as e:
+        return jsonify({'error': f'Erro ao buscar distribuições: {str(e)}'}), 500
+
+@distributions_bp.route('', methods=['POST'])
+@token_required
+async def create_distribution(current_user):
+    """Cria uma nova distribuição."""
+    data = await request.get_json()
+    
+    if not data or not data.get('familyId') or not data.get('quantity'):
+        return jsonify({'error': 'Dados incompletos'}), 400
+    
+    try:
+        async with get_db_connection() as conn:
+            # Verificar se há cestas suficientes em estoque
+            total_donations = await conn.fetchval(QUERIES['donations_total'])
+            total_distributions = await conn.fetchval(QUERIES['distributions_total'])
+            
+            available = total_donations - total_distributions
+            
+            if available < data['quantity']:
+                return jsonify({'error': f'Cestas insuficientes. Disponível: {available}'}), 400
+            
+            # Criar distribuição
+            distribution_date = datetime.fromisoformat(data['date'].replace('Z', '+00:00')) if data.get('date') else datetime.now()
+            
+            distribution = await conn.fetchrow(
+                QUERIES['distribution_insert'],
+                data['familyId'],
+                data['familyName'],
+                data['pickupPersonName'],
+                data['quantity'],
+                distribution_date
+            )
+            
+            result = {
+                'id': str(distribution['id']),
+                'familyId': data['familyId'],
+                'familyName': data['familyName'],
+                'pickupPersonName': data['pickupPersonName'],
+                'quantity': data['quantity'],
+                'date': distribution_date.isoformat(),
+                'createdAt': distribution['created_at'].isoformat()
+            }
+            await notify_change(conn, 'distribution', result)
+        
+        record_audit(current_user, 'create', 'distribution', distribution['id'], audit_fields(data))
+        return jsonify(result), 201
+    
+    except Exception as e:
+        return jsonify({'error': f'Erro ao criar distribuição: {str(e)}'}), 500
+
+@distributions_bp.route('/total', methods=['GET'])
+@token_required
+async def get_total_distributions(current_user):
+    """Retorna o total de cestas distribuídas."""
+    try:
+        async with get_db_connection() as conn:
+            total = await conn.fetchval(QUERIES['distributions_total'])
+        
+        return jsonify({'total': total}), 200
+    
+    except Exception as e:
+        return jsonify({'error': f'Erro ao calcular total de distribuições: {str(e)}'}), 500
@@ -0,0 +1,79 @@
+from quart import Blueprint, request, jsonify
+from app.aio.database import get_db_connection
+from app.utils.queries import QUERIES
+from app.aio.auth import token_required
+from app.aio.events import notify_change
+from app.utils.audit import record_audit, audit_fields
+from app.utils.partitions import parse_created_range
+from app.utils.serializers import serialize_donation
+
+donations_bp = Blueprint('donations', __name__, url_prefix='/api/donations')
+
+@donations_bp.route('', methods=['GET'])
+@token_required
+async def get_donations(current_user):
+    """Lista todas as doações (opcionalmente entre as datas `from` e `to`)."""
+    try:
+        created_range = parse_created_range(request.args)
+    except ValueError:
+        return jsonify({'error': 'Período inválido'}), 400
+    
+    try:
+        async with get_db_connection() as conn:
+            if created_range:
+                donations = await conn.fetch(QUERIES['donation_list_between'], *created_range)
+            else:
+                donations = await conn.fetch(QUERIES['donation_list'])
+        
+        return jsonify([serialize_donation(donation) for donation in donations]), 200
+    
+    except Exception as e:
+        return jsonify({'error': f'Erro ao buscar doações: {str(e)}'}), 500
+
+@donations_bp.route('', methods=['POST'])
+@token_required
+async def create_donation(current_user):
+    """Cria uma nova doação."""
+    data = await request.get_json()
+    
+    if not data or not data.get('responsibleName') or not data.get('quantity'):
+        return jsonify({'error': 'Dados incompletos'}), 400
+    
+    try:
+        async with get_db_connection() as conn:
+            donation = await conn.fetchrow(
+                QUERIES['donation_insert'],
+                data['responsibleName'],
+                data.get('cpf', ''),
+                data.get('phone', ''),
+                data['quantity'],
+                data.get('type', 'entry')
+            )
+            await notify_change(conn, 'donation')
+        
+        record_audit(current_user, 'create', 'donation', donation['id'], audit_fields(data))
+        return jsonify({
+            'id': str(donation['id']),
+            'responsibleName': data['responsibleName'],
+            'cpf': data.get('cpf', ''),
+            'phone': data.get('phone', ''),
+            'quantity': data['quantity'],
+            'type': data.get('type', 'entry'),
+            'createdAt': donation['created_at'].isoformat()
+        }), 201
+    
+    except Exception as e:
+        return jsonify({'error': f'Erro ao criar doação: {str(e)}'}), 500
+
+@donations_bp.route('/total', methods=['GET'])
+@token_required
+async def get_total_donations(current_user):
+    """Retorna o total de cestas doadas."""
+    try:
+        async with get_db_connection() as conn:
+            total = await conn.fetchval(QUERIES['donations_total'])
+        
+        return jsonify({'total': total}), 200
+    
+    except Exception as e:
+        return jsonify({'error': f'Erro ao calcular total de doações: {str(e)}'}), 500
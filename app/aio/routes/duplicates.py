@@ -0,0 +1,62 @@
+import json
+from quart import Blueprint, request, jsonify
+from app.aio.database import get_db_connection
+from app.utils.queries import QUERIES
+from app.aio.auth import token_required
+from app.utils.audit import record_audit
+from app.utils.dedupe import DUPLICATE_STATUSES
+from app.utils.serializers import serialize_duplicate
+
+duplicates_bp = Blueprint('duplicates', __name__, url_prefix='/api/duplicates')
+
+@duplicates_bp.route('', methods=['GET'])
+@token_required
+async def get_duplicates(current_user):
+    """Fila de revisão: pares de famílias possivelmente duplicadas."""
+    status = request.args.get('status', 'pending')
+    if status not in DUPLICATE_STATUSES:
+        return jsonify({'error': f'Status inválido. Status: {", ".join(DUPLICATE_STATUSES)}'}), 400
+    
+    try:
+        limit = int(request.args.get('limit', 50))
+    except ValueError:
+        limit = 0
+    if not 1 <= limit <= 500:
+        return jsonify({'error': 'limit deve estar entre 1 e 500'}), 400
+    
+    try:
+        async with get_db_connection() as conn:
+            duplicates = await conn.fetch(QUERIES['duplicates_by_status'], status, limit)
+        
+        # asyncpg devolve JSONB como texto
+        return jsonify([
+            serialize_duplicate(dict(duplicate, reasons=json.loads(duplicate['reasons'])))
+            for duplicate in duplicates
+        ]), 200
+    
+    except Exception as e:
+        return jsonify({'error': f'Erro ao buscar duplicatas: {str(e)}'}), 500
+
+@duplicates_bp.route('/<duplicate_id>', methods=['PUT'])
+@token_required
+async def review_duplicate(current_user, duplicate_id):
+    """Marca um par como duplicata confirmada ou descartada."""
+    data = await request.get_json()
+    
+    if not data or data.get('status') not in DUPLICATE_STATUSES:
+        return jsonify({'error': f'Status inválido. Status: {", ".join(DUPLICATE_STATUSES)}'}), 400
+    
+    try:
+        async with get_db_connection() as conn:
+            result = await conn.fetchrow(
+                QUERIES['duplicate_review'], duplicate_id, data['status'], current_user['user_id']
+            )
+            
+            if not result:
+                return jsonify({'error': 'Par não encontrado'}), 404
+        
+        record_audit(current_user, 'update', 'duplicate', duplicate_id, {'status': data['status']})
+        return jsonify({'id': duplicate_id, 'status': result['status']}), 200
+    
+    except Exception as e:
+        return jsonify({'error': f'Erro ao revisar duplicata: {str(e)}'}), 500
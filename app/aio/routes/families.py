@@ -0,0 +1,204 @@
+import json
+from quart import Blueprint, request, jsonify
+from app.aio.database import get_db_connection
+from app.utils.queries import QUERIES
+from app.aio.auth import token_required
+from app.aio.events import notify_change
+from app.utils.audit import record_audit, audit_fields
+from app.jobs import JOB_MAX_ATTEMPTS
+from app.utils.serializers import serialize_family
+
+families_bp = Blueprint('families', __name__, url_prefix='/api/families')
+
+async def insert_children(conn, family_id, children):
+    """Insere os filhos de uma família e devolve no formato da API."""
+    result = []
+    for child in children or []:
+        child_data = await conn.fetchrow(QUERIES['child_insert'], family_id, child['name'], child['age'])
+        
+        result.append({
+            'id': str(child_data['id']),
+            'name': child_data['name'],
+            'age': child_data['age']
+        })
+    return result
+
+@families_bp.route('', methods=['GET'])
+@token_required
+async def get_families(current_user):
+    """Lista todas as famílias."""
+    try:
+        async with get_db_connection() as conn:
+            families = await conn.fetch(QUERIES['family_list'])
+            
+            # Buscar os filhos de todas as famílias em uma única consulta
+            children = await conn.fetch(
+                QUERIES['children_by_families'],
+                [str(family['id']) for family in families]
+            )
+        
+        children_by_family = {}
+        for child in children:
+            children_by_family.setdefault(child['family_id'], []).append(child)
+        
+        return jsonify([
+            serialize_family(family, children_by_family.get(family['id'], []))
+            for family in families
+        ]), 200
+    
+    except Exception as e:
+        return jsonify({'error': f'Erro ao buscar famílias: {str(e)}'}), 500
+
+@families_bp.route('', methods=['POST'])
+@token_required
+async def create_family(current_user):
+    """Cria uma nova família."""
+    data = await request.get_json()
+    
+    if not data or not data.get('name'):
+        return jsonify({'error': 'Nome da família é obrigatório'}), 400
+    
+    try:
+        async with get_db_connection() as conn:
+            # Inserir família
+            family = await conn.fetchrow(
+                QUERIES['family_insert'],
+                data['name'],
+                data.get('fatherName'),
+                data.get('motherName'),
+                data.get('numberOfChildren', 0),
+                data.get('isEmployed', False),
+                data.get('receivesGovernmentAid', False),
+                data.get('governmentAidType'),
+                data.get('hasCriticalFactor', False),
+                data.get('criticalFactorNotes')
+            )
+            
+            # Inserir filhos
+            children = await insert_children(conn, family['id'], data.get('children'))
+            
+            # Duplicatas verificadas pelo worker, sem atrasar o cadastro
+            await conn.execute(
+                QUERIES['job_insert'], 'dedupe_family',
+                json.dumps({'familyId': str(family['id'])}), JOB_MAX_ATTEMPTS, None
+            )
+            await notify_change(conn, 'family')
+        
+        record_audit(current_user, 'create', 'family', family['id'], audit_fields(data))
+        return jsonify({
+            'id': str(family['id']),
+            'name': data['name'],
+            'fatherName': data.get('fatherName'),
+            'motherName': data.get('motherName'),
+            'numberOfChildren': data.get('numberOfChildren', 0),
+            'children': children,
+            'isEmployed': data.get('isEmployed', False),
+            'receivesGovernmentAid': data.get('receivesGovernmentAid', False),
+            'governmentAidType': data.get('governmentAidType'),
+            'hasCriticalFactor': data.get('hasCriticalFactor', False),
+            'criticalFactorNotes': data.get('criticalFactorNotes'),
+            'createdAt': family['created_at'].isoformat(),
+            'updatedAt': family['updated_at'].isoformat()
+        }), 201
+    
+    except Exception as e:
+        return jsonify({'error': f'Erro ao criar família: {str(e)}'}), 500
+
+@families_bp.route('/<family_id>', methods=['GET'])
+@token_required
+async def get_family(current_user, family_id):
+    """Busca uma família por ID."""
+    try:
+        async with get_db_connection() as conn:
+            family = await conn.fetchrow(QUERIES['family_by_id'], family_id)
+            
+            if not family:
+                return jsonify({'error': 'Família não encontrada'}), 404
+            
+            # Buscar filhos
+            children = await conn.fetch(QUERIES['children_by_family'], family_id)
+        
+        return jsonify(serialize_family(family, children)), 200
+    
+    except Exception as e:
+        return jsonify({'error': f'Erro ao buscar família: {str(e)}'}), 500
+
+@families_bp.route('/<family_id>', methods=['PUT'])
+@token_required
+async def update_family(current_user, family_id):
+    """Atualiza uma família."""
+    data = await request.get_json()
+    
+    try:
+        async with get_db_connection() as conn:
+            # Atualizar família
+            result = await conn.fetchrow(
+                QUERIES['family_update'],
+                data.get('name'),
+                data.get('fatherName'),
+                data.get('motherName'),
+                data.get('numberOfChildren', 0),
+                data.get('isEmployed', False),
+                data.get('receivesGovernmentAid', False),
+                data.get('governmentAidType'),
+                data.get('hasCriticalFactor', False),
+                data.get('criticalFactorNotes'),
+                family_id
+            )
+            
+            if not result:
+                return jsonify({'error': 'Família não encontrada'}), 404
+            
+            # Deletar filhos antigos e inserir novos
+            await conn.execute(QUERIES['children_delete'], family_id)
+            children = await insert_children(conn, family_id, data.get('children'))
+            
+            # Duplicatas verificadas pelo worker, sem atrasar o cadastro
+            await conn.execute(
+                QUERIES['job_insert'], 'dedupe_family',
+                json.dumps({'familyId': family_id}), JOB_MAX_ATTEMPTS, None
+            )
+            await notify_change(conn, 'family')
+        
+        record_audit(current_user, 'update', 'family', family_id, audit_fields(data))
+        return jsonify({
+            'id': family_id,
+            'name': data.get('name'),
+            'fatherName': data.get('fatherName'),
+            'motherName': data.get('motherName'),
+            'numberOfChildren': data.get('numberOfChildren', 0),
+            'children': children,
+            'isEmployed': data.get('isEmployed', False),
+            'receivesGovernmentAid': data.get('receivesGovernmentAid', False),
+            'governmentAidType': data.get('governmentAidType'),
+            'hasCriticalFactor': data.get('hasCriticalFactor', False),
+            'criticalFactorNotes': data.get('criticalFactorNotes'),
+            'updatedAt': result['updated_at'].isoformat()
+        }), 200
+    
+    except Exception as e:
+        return jsonify({'error': f'Erro ao atualizar família: {str(e)}'}), 500
+
+@families_bp.route('/<family_id>', methods=['DELETE'])
+@token_required
+async def delete_family(current_user, family_id):
+    """Deleta uma família."""
+    try:
+        async with get_db_connection() as conn:
+            # Travar a família impede novas distribuições até o commit, então
+            # as distribuições lidas aqui são exatamente as removidas em cascata
+            if not await conn.fetchrow(QUERIES['family_lock'], family_id):
+                return jsonify({'error': 'Família não encontrada'}), 404
+            
+            rows = await conn.fetch(QUERIES['distribution_ids_by_family'], family_id)
+            await conn.execute(QUERIES['family_delete'], family_id)
+            
+            await notify_change(conn, 'family')
+        
+        record_audit(current_user, 'delete', 'family', family_id)
+        for row in rows:
+            record_audit(current_user, 'delete', 'distribution', row['id'], {'familyId': family_id})
+        return jsonify({'message': 'Família deletada com sucesso'}), 200
+    
+    except Exception as e:
+        return jsonify({'error': f'Erro ao deletar família: {str(e)}'}), 500
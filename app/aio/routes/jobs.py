@@ -0,0 +1,96 @@
+import json
+import os
+from quart import Blueprint, request, jsonify, send_file
+from app.aio.database import get_db_connection
+from app.utils.queries import QUERIES
+from app.aio.auth import token_required
+from app.utils.serializers import serialize_job
+from app.jobs import JOB_MAX_ATTEMPTS
+from app.jobs.tasks import validate_job
+
+jobs_bp = Blueprint('jobs', __name__, url_prefix='/api/jobs')
+
+@jobs_bp.route('', methods=['POST'])
+@token_required
+async def create_job(current_user):
+    """Enfileira um job e retorna imediatamente."""
+    data = await request.get_json()
+    
+    if not data:
+        return jsonify({'error': 'Dados incompletos'}), 400
+    
+    # Parâmetros inválidos falhariam em todas as tentativas no worker
+    try:
+        validate_job(data.get('type'), data.get('params'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        async with get_db_connection() as conn:
+            job = await conn.fetchrow(
+                QUERIES['job_insert'],
+                data['type'],
+                json.dumps(data.get('params') or {}),
+                JOB_MAX_ATTEMPTS,
+                current_user['user_id']
+            )
+        
+        return jsonify(serialize_job(job)), 202
+    
+    except Exception as e:
+        return jsonify({'error': f'Erro ao criar job: {str(e)}'}), 500
+
+@jobs_bp.route('', methods=['GET'])
+@token_required
+async def get_jobs(current_user):
+    """Lista os últimos jobs do usuário."""
+    try:
+        async with get_db_connection() as conn:
+            jobs = await conn.fetch(QUERIES['jobs_by_user'], current_user['user_id'])
+        
+        return jsonify([serialize_job(job) for job in jobs]), 200
+    
+    except Exception as e:
+        return jsonify({'error': f'Erro ao buscar jobs: {str(e)}'}), 500
+
+@jobs_bp.route('/<job_id>', methods=['GET'])
+@token_required
+async def get_job(current_user, job_id):
+    """Retorna o status e o progresso de um job."""
+    try:
+        async with get_db_connection() as conn:
+            job = await conn.fetchrow(QUERIES['job_by_id'], job_id, current_user['user_id'])
+        
+        if not job:
+            return jsonify({'error': 'Job não encontrado'}), 404
+        
+        return jsonify(serialize_job(job)), 200
+    
+    except Exception as e:
+        return jsonify({'error': f'Erro ao buscar job: {str(e)}'}), 500
+
+@jobs_bp.route('/<job_id>/result', methods=['GET'])
+@token_required
+async def get_job_result(current_user, job_id):
+    """Baixa o arquivo de resultado de um job concluído."""
+    try:
+        async with get_db_connection() as conn:
+            job = await conn.fetchrow(QUERIES['job_by_id'], job_id, current_user['user_id'])
+    
+    except Exception as e:
+        return jsonify({'error': f'Erro ao buscar job: {str(e)}'}), 500
+    
+    if not job:
+        return jsonify({'error': 'Job não encontrado'}), 404
+    
+    if job['status'] != 'succeeded' or not job['result_path']:
+        return jsonify({'error': 'Job ainda não concluído', 'status': job['status']}), 409
+    
+    if not os.path.exists(job['result_path']):
+        return jsonify({'error': 'Arquivo de resultado não encontrado'}), 410
+    
+    return await send_file(
+        os.path.abspath(job['result_path']),
+        as_attachment=True,
+        download_name=f"{job['type']}-{job_id}{os.path.splitext(job['result_path'])[1]}"
+    )
@@ -0,0 +1,71 @@
+from quart import Blueprint, request, jsonify
+from app.aio.database import get_db_connection
+from app.utils.queries import QUERIES
+from app.aio.auth import token_required
+from app.utils.database import SYNC_RETENTION_DAYS
+from app.utils.serializers import serialize_family, serialize_donation, serialize_distribution
+from datetime import datetime, timedelta
+
+sync_bp = Blueprint('sync', __name__, url_prefix='/api/sync')
+
+@sync_bp.route('', methods=['GET'])
+@token_required
+async def get_changes(current_user):
+    """Retorna as alterações feitas desde o token informado em `since`."""
+    since = None
+    if request.args.get('since'):
+        try:
+            since = datetime.fromisoformat(request.args['since'])
+        except ValueError:
+            return jsonify({'error': 'Token de sincronização inválido'}), 400
+    
+    try:
+        async with get_db_connection() as conn:
+            # Mesmo critério do modo síncrono: início da transação mais
+            # antiga ainda aberta, com ou sem escrita
+            token = await conn.fetchval(QUERIES['sync_token'])
+            
+            # Tokens mais antigos que a retenção dos tombstones exigem carga completa
+            if since and since < token - timedelta(days=SYNC_RETENTION_DAYS):
+                since = None
+            
+            if since:
+                suffix, params = 'since', [since]
+            else:
+                suffix, params = 'all', []
+            
+            families = await conn.fetch(QUERIES[f'sync_families_{suffix}'], *params)
+            
+            children_by_family = {}
+            if families:
+                children = await conn.fetch(
+                    QUERIES['children_by_families'],
+                    [str(family['id']) for family in families]
+                )
+                for child in children:
+                    children_by_family.setdefault(child['family_id'], []).append(child)
+            
+            donations = await conn.fetch(QUERIES[f'sync_donations_{suffix}'], *params)
+            distributions = await conn.fetch(QUERIES[f'sync_distributions_{suffix}'], *params)
+            
+            # Registros excluídos (inclusive em cascata)
+            deleted = {'families': [], 'children': [], 'donations': [], 'distributions': []}
+            if since:
+                tombstones = await conn.fetch(QUERIES['sync_tombstones_since'], since)
+                for tombstone in tombstones:
+                    deleted.setdefault(tombstone['table_name'], []).append(str(tombstone['record_id']))
+        
+        return jsonify({
+            'token': token.isoformat(),
+            'full': since is None,
+            'families': [
+                serialize_family(family, children_by_family.get(family['id'], []))
+                for family in families
+            ],
+            'donations': [serialize_donation(donation) for donation in donations],
+            'distributions': [serialize_distribution(dist) for dist in distributions],
+            'deleted': deleted
+        }), 200
+    
+    except Exception as e:
+        return jsonify({'error': f'Erro ao sincronizar dados: {str(e)}'}), 500
@@ -0,0 +1,23 @@
+import json
+import os
+from app.utils.queries import execute
+
+# Diretório onde os jobs gravam seus arquivos de resultado
+JOBS_RESULT_DIR = os.getenv('JOBS_RESULT_DIR', os.path.join('storage', 'jobs'))
+
+# Tentativas por job e espera base (em segundos) entre elas; a espera dobra a cada falha
+JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', 3))
+JOB_RETRY_BACKOFF = float(os.getenv('JOB_RETRY_BACKOFF', 30))
+
+def enqueue(cursor, job_type, params=None, created_by=None, max_attempts=JOB_MAX_ATTEMPTS):
+    """Enfileira um job na transação do cursor e devolve o registro criado.
+
+    O job só fica visível para o worker quando a transação é confirmada.
+    """
+    execute(cursor, 'job_insert', (job_type, json.dumps(params or {}), max_attempts, created_by))
+    return cursor.fetchone()
+
+def result_path(job_id, extension):
+    """Caminho do arquivo de resultado de um job."""
+    os.makedirs(JOBS_RESULT_DIR, exist_ok=True)
+    return os.path.join(JOBS_RESULT_DIR, f"{job_id}.{extension}")
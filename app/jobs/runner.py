@@ -0,0 +1,153 @@
+import os
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from app.jobs import JOB_RETRY_BACKOFF
+from app.jobs.tasks import JOB_TYPES
+from app.utils.database import get_db_connection, SYNC_RETENTION_DAYS
+from app.utils.partitions import ensure_all_partitions
+from app.utils.queries import execute
+
+# Jobs executados ao mesmo tempo por processo worker
+JOB_WORKER_THREADS = int(os.getenv('JOB_WORKER_THREADS', 4))
+
+# Intervalo (em segundos) entre buscas por novos jobs
+JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', 2))
+
+# Intervalo do heartbeat dos jobs em execução; sem heartbeat por
+# JOB_STALE_AFTER segundos o job é considerado abandonado e volta para a fila
+JOB_HEARTBEAT_INTERVAL = 30
+JOB_STALE_AFTER = 300
+
+# Intervalo (em segundos) entre as tarefas periódicas do banco: partições
+# futuras e limpeza dos tombstones
+PERIODIC_MAINTENANCE_INTERVAL = 3600
+
+class JobRunner:
+    """Processo worker: busca jobs na fila e os executa em threads.
+
+    Os jobs são reservados com SELECT ... FOR UPDATE SKIP LOCKED, então
+    vários workers podem rodar ao mesmo tempo sem pegar o mesmo job. O
+    limite de concorrência de cada tipo vale para todos os workers juntos.
+    """
+
+    def __init__(self, threads=JOB_WORKER_THREADS, poll_interval=JOB_POLL_INTERVAL):
+        self.threads = threads
+        self.poll_interval = poll_interval
+        self.executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='job')
+        self.running = {}
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+
+    def stop(self, *args):
+        print("Encerrando worker: aguardando os jobs em execução...")
+        self.stopping.set()
+
+    def claim(self):
+        """Reserva o próximo job de um tipo que ainda tenha vaga."""
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+
+            # Serializa as reservas para que a contagem por tipo seja confiável
+            execute(cursor, 'jobs_claim_lock')
+            execute(cursor, 'jobs_running_by_type')
+            running = {row['type']: row['running'] for row in cursor.fetchall()}
+            available = [
+                job_type for job_type, config in JOB_TYPES.items()
+                if running.get(job_type, 0) < config['concurrency']
+            ]
+            if not available:
+                return None
+
+            execute(cursor, 'job_claim', (available,))
+            job = cursor.fetchone()
+            cursor.close()
+            return job
+
+    def report_progress(self, job_id, progress):
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            execute(cursor, 'job_progress', (job_id, max(0, min(progress, 99))))
+            cursor.close()
+
+    def run_job(self, job):
+        job_id = str(job['id'])
+        try:
+            handler = JOB_TYPES[job['type']]['handler']
+            path = handler(job, lambda progress: self.report_progress(job_id, progress))
+            with get_db_connection() as conn:
+                cursor = conn.cursor()
+                execute(cursor, 'job_succeeded', (job_id, path))
+                cursor.close()
+            print(f"✓ Job {job['type']} {job_id} concluído")
+        except Exception as e:
+            with get_db_connection() as conn:
+                cursor = conn.cursor()
+                execute(cursor, 'job_failed', (job_id, str(e), JOB_RETRY_BACKOFF))
+                status = cursor.fetchone()['status']
+                cursor.close()
+            print(f"✗ Job {job['type']} {job_id} falhou ({status}): {e}")
+        finally:
+            with self.lock:
+                self.running.pop(job_id, None)
+
+    def maintenance(self):
+        """Heartbeat dos jobs deste worker e recuperação de jobs abandonados."""
+        with self.lock:
+            job_ids = list(self.running)
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            if job_ids:
+                execute(cursor, 'jobs_heartbeat', (job_ids,))
+            execute(cursor, 'jobs_requeue_stale', (JOB_STALE_AFTER,))
+            for row in cursor.fetchall():
+                print(f"↻ Job {row['id']} abandonado devolvido à fila")
+            cursor.close()
+
+    def periodic_maintenance(self):
+        """Tarefas do banco que a API não executa (init_db não roda sob o gunicorn)."""
+        ensure_all_partitions()
+
+        # Tombstones mais antigos que a retenção: tokens tão antigos já
+        # recebem a carga completa
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            execute(cursor, 'tombstones_prune', (SYNC_RETENTION_DAYS,))
+            if cursor.rowcount:
+                print(f"✓ {cursor.rowcount} tombstones antigos removidos")
+            cursor.close()
+
+    def run(self):
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        print(f"✓ Worker de jobs iniciado ({self.threads} threads)")
+
+        last_maintenance = 0
+        last_periodic = None
+        while not self.stopping.is_set():
+            try:
+                if time.monotonic() - last_maintenance >= JOB_HEARTBEAT_INTERVAL:
+                    self.maintenance()
+                    last_maintenance = time.monotonic()
+
+                if last_periodic is None or time.monotonic() - last_periodic >= PERIODIC_MAINTENANCE_INTERVAL:
+                    last_periodic = time.monotonic()
+                    self.periodic_maintenance()
+
+                with self.lock:
+                    has_capacity = len(self.running) < self.threads
+
+                job = self.claim() if has_capacity else None
+                if job:
+                    with self.lock:
+                        self.running[str(job['id'])] = job['type']
+                    self.executor.submit(self.run_job, job)
+                    continue
+            except Exception as e:
+                print(f"✗ Erro no worker de jobs: {e}")
+
+            self.stopping.wait(self.poll_interval)
+
+        self.executor.shutdown(wait=True)
+        print("✓ Worker encerrado")
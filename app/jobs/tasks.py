@@ -0,0 +1,275 @@
+import json
+import os
+import uuid
+from datetime import date
+from app.jobs import enqueue, result_path
+from app.utils.database import get_db_connection
+from app.utils.events import notify_change
+from app.utils.audit import record_audit
+from app.utils.dedupe import check_families
+from app.utils.queries import execute
+from app.utils.serializers import serialize_family, serialize_donation, serialize_distribution
+
+# Registros lidos por vez (e por transação) nas exportações
+EXPORT_BATCH_SIZE = 500
+
+# Menor UUID: ponto de partida da leitura em lotes
+EXPORT_FIRST_ID = '00000000-0000-0000-0000-000000000000'
+
+# Famílias verificadas por transação na busca de duplicatas em lote
+DEDUPE_BATCH_SIZE = 200
+
+def write_result(job, extension, content):
+    """Grava o resultado de um job de forma atômica e devolve o caminho."""
+    path = result_path(job['id'], extension)
+    with open(path + '.tmp', 'w', encoding='utf-8') as output:
+        json.dump(content, output, ensure_ascii=False)
+    os.replace(path + '.tmp', path)
+    return path
+
+def export_data(job, report):
+    """Exporta famílias (com filhos), doações e distribuições em um arquivo JSON.
+
+    Cada lote é lido em uma transação curta, continuando do último id: uma
+    transação aberta durante toda a exportação seguraria o token da
+    sincronização e faria os tablets baixarem tudo de novo. Registros
+    criados ou alterados durante a exportação podem ou não aparecer nela.
+    """
+    path = result_path(job['id'], 'json')
+    exports = [
+        ('families', 'export_families_page'),
+        ('donations', 'export_donations_page'),
+        ('distributions', 'export_distributions_page'),
+    ]
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        execute(cursor, 'families_count')
+        total = cursor.fetchone()['total']
+        execute(cursor, 'donations_count')
+        total += cursor.fetchone()['total']
+        execute(cursor, 'distributions_count')
+        total += cursor.fetchone()['total']
+        cursor.close()
+    done = 0
+
+    with open(path + '.tmp', 'w', encoding='utf-8') as output:
+        output.write('{')
+        for index, (key, query) in enumerate(exports):
+            output.write(f'{"," if index else ""}"{key}":[')
+            first = True
+            last_id = EXPORT_FIRST_ID
+
+            while True:
+                with get_db_connection() as conn:
+                    cursor = conn.cursor()
+                    execute(cursor, query, (last_id, EXPORT_BATCH_SIZE))
+                    rows = cursor.fetchall()
+
+                    if key == 'families' and rows:
+                        execute(cursor, 'children_by_families', ([str(row['id']) for row in rows],))
+                        children_by_family = {}
+                        for child in cursor.fetchall():
+                            children_by_family.setdefault(str(child['family_id']), []).append(child)
+                    cursor.close()
+
+                if not rows:
+                    break
+
+                if key == 'families':
+                    items = [serialize_family(row, children_by_family.get(str(row['id']), [])) for row in rows]
+                elif key == 'donations':
+                    items = [serialize_donation(row) for row in rows]
+                else:
+                    items = [serialize_distribution(row) for row in rows]
+
+                for item in items:
+                    output.write(('' if first else ',') + json.dumps(item, ensure_ascii=False))
+                    first = False
+
+                last_id = str(rows[-1]['id'])
+                done += len(rows)
+                report(min(int(done * 100 / total), 100) if total else 100)
+            output.write(']')
+        output.write('}')
+
+    os.replace(path + '.tmp', path)
+    return path
+
+def import_families(job, report):
+    """Importa famílias (formato da API) em uma única transação.
+
+    Se o job falhar e for repetido, nada da tentativa anterior foi gravado.
+    """
+    families = job['params'].get('families') or []
+    imported = []
+    errors = []
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        for index, data in enumerate(families):
+            if not data.get('name'):
+                errors.append({'index': index, 'error': 'Nome da família é obrigatório'})
+                continue
+
+            execute(cursor, 'family_insert', (
+                data['name'],
+                data.get('fatherName'),
+                data.get('motherName'),
+                data.get('numberOfChildren', 0),
+                data.get('isEmployed', False),
+                data.get('receivesGovernmentAid', False),
+                data.get('governmentAidType'),
+                data.get('hasCriticalFactor', False),
+                data.get('criticalFactorNotes')
+            ))
+            family_id = str(cursor.fetchone()['id'])
+            for child in data.get('children') or []:
+                execute(cursor, 'child_insert', (family_id, child['name'], child['age']))
+            imported.append(family_id)
+
+            if index % 50 == 0:
+                report(int(index * 100 / len(families)))
+
+        if imported:
+            # Duplicatas das famílias importadas, verificadas em lote
+            enqueue(cursor, 'dedupe_scan', {'familyIds': imported})
+            notify_change(cursor, 'family')
+        cursor.close()
+
+    # Auditoria em nome do usuário que enfileirou a importação
+    created_by = {'user_id': str(job['created_by']) if job['created_by'] else None, 'username': None}
+    for family_id in imported:
+        record_audit(created_by, 'create', 'family', family_id, {'jobId': str(job['id'])})
+
+    return write_result(job, 'json', {
+        'imported': len(imported),
+        'familyIds': imported,
+        'errors': errors
+    })
+
+def yearly_report(job, report):
+    """Gera o relatório mensal de doações e distribuições de um ano."""
+    year = int(job['params'].get('year') or date.today().year)
+    start, end = date(year, 1, 1), date(year + 1, 1, 1)
+
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        execute(cursor, 'report_donations_by_month', (start, end))
+        donations = {row['month']: row['total'] for row in cursor.fetchall()}
+        report(50)
+        execute(cursor, 'report_distributions_by_month', (start, end))
+        distributions = {row['month']: row for row in cursor.fetchall()}
+        cursor.close()
+
+    months = []
+    for number in range(1, 13):
+        month = date(year, number, 1)
+        dist = distributions.get(month)
+        months.append({
+            'month': month.strftime('%Y-%m'),
+            'donations': donations.get(month, 0),
+            'distributions': dist['total'] if dist else 0,
+            'familiesServed': dist['families'] if dist else 0
+        })
+
+    return write_result(job, 'json', {
+        'year': year,
+        'months': months,
+        'totalDonations': sum(month['donations'] for month in months),
+        'totalDistributions': sum(month['distributions'] for month in months)
+    })
+
+def dedupe_family(job, report):
+    """Procura duplicatas de uma família cadastrada ou alterada."""
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        check_families(cursor, [job['params']['familyId']])
+        cursor.close()
+    return None
+
+def dedupe_scan(job, report):
+    """Procura duplicatas em lote: das famílias em `familyIds` ou de todas."""
+    family_ids = job['params'].get('familyIds')
+    if family_ids is None:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            execute(cursor, 'family_ids')
+            family_ids = [str(row['id']) for row in cursor.fetchall()]
+            cursor.close()
+
+    found = 0
+    for start in range(0, len(family_ids), DEDUPE_BATCH_SIZE):
+        # Uma transação por lote: o lock da verificação não fica preso
+        # durante a busca inteira
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            found += check_families(cursor, family_ids[start:start + DEDUPE_BATCH_SIZE])
+            cursor.close()
+        report(int((start + DEDUPE_BATCH_SIZE) * 100 / len(family_ids)))
+
+    return write_result(job, 'json', {'checked': len(family_ids), 'candidates': found})
+
+def is_integer(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def validate_no_params(params):
+    pass
+
+def validate_import_families(params):
+    """Valida a lista de famílias antes de enfileirar a importação."""
+    families = params.get('families')
+    if not isinstance(families, list) or not families:
+        raise ValueError('params.families deve ser uma lista de famílias')
+    for index, data in enumerate(families):
+        if not isinstance(data, dict):
+            raise ValueError(f'Família {index}: formato inválido')
+        if 'numberOfChildren' in data and not is_integer(data['numberOfChildren']):
+            raise ValueError(f'Família {index}: numberOfChildren deve ser um número inteiro')
+        children = data.get('children') or []
+        if not isinstance(children, list):
+            raise ValueError(f'Família {index}: children deve ser uma lista')
+        for child in children:
+            if not isinstance(child, dict) or not isinstance(child.get('name'), str) or not child['name'].strip():
+                raise ValueError(f'Família {index}: todo filho precisa de name')
+            if not is_integer(child.get('age')) or child['age'] < 0:
+                raise ValueError(f'Família {index}: todo filho precisa de age (inteiro)')
+
+def validate_yearly_report(params):
+    year = params.get('year')
+    if year is not None and (not is_integer(year) or not 1900 <= year <= 2100):
+        raise ValueError('params.year deve ser um ano (número inteiro)')
+
+def validate_dedupe_scan(params):
+    family_ids = params.get('familyIds')
+    if family_ids is None:
+        return
+    if not isinstance(family_ids, list):
+        raise ValueError('params.familyIds deve ser uma lista de ids')
+    for family_id in family_ids:
+        try:
+            uuid.UUID(str(family_id))
+        except ValueError:
+            raise ValueError(f'Id de família inválido: {family_id}')
+
+# Tipos de job: função executada, quantos podem rodar ao mesmo tempo e a
+# validação dos parâmetros. Tipos sem `validate` são internos (enfileirados
+# só pela aplicação, não por POST /api/jobs).
+JOB_TYPES = {
+    'export': {'handler': export_data, 'concurrency': 1, 'validate': validate_no_params},
+    'import_families': {'handler': import_families, 'concurrency': 1, 'validate': validate_import_families},
+    'yearly_report': {'handler': yearly_report, 'concurrency': 2, 'validate': validate_yearly_report},
+    'dedupe_family': {'handler': dedupe_family, 'concurrency': 1},
+    'dedupe_scan': {'handler': dedupe_scan, 'concurrency': 1, 'validate': validate_dedupe_scan},
+}
+
+# Tipos que podem ser enfileirados pela API
+PUBLIC_JOB_TYPES = [job_type for job_type, config in JOB_TYPES.items() if 'validate' in config]
+
+def validate_job(job_type, params):
+    """Valida um job pedido pela API; levanta ValueError se for inválido."""
+    if job_type not in PUBLIC_JOB_TYPES:
+        raise ValueError(f'Tipo de job inválido. Tipos: {", ".join(PUBLIC_JOB_TYPES)}')
+    if params is not None and not isinstance(params, dict):
+        raise ValueError('params deve ser um objeto')
+    JOB_TYPES[job_type]['validate'](params or {})
@@ -0,0 +1,36 @@
+from flask import Blueprint, request, jsonify
+from app.utils.database import get_db_connection
+from app.utils.queries import execute
+from app.utils.auth import token_required
+from app.utils.serializers import serialize_audit
+from app.utils.audit import parse_audit_filters
+
+audit_bp = Blueprint('audit', __name__, url_prefix='/api/audit')
+
+@audit_bp.route('', methods=['GET'])
+@token_required
+def get_audit(current_user):
+    """Lista a trilha de auditoria, do mais recente para o mais antigo.
+
+    Filtros: `entityType` + `entityId`, `userId` e `since`. Para a próxima
+    página, envie `before` com o `nextBefore` da resposta.
+    """
+    try:
+        query, params, limit = parse_audit_filters(request.args)
+    except ValueError as e:
+        return jsonify({'error': f'Filtro inválido: {str(e)}'}), 400
+    
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            execute(cursor, query, params)
+            entries = cursor.fetchall()
+            cursor.close()
+            
+            return jsonify({
+                'entries': [serialize_audit(entry) for entry in entries],
+                'nextBefore': entries[-1]['id'] if len(entries) == limit else None
+            }), 200
+    
+    except Exception as e:
+        return jsonify({'error': f'Erro ao buscar auditoria: {str(e)}'}), 500
@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
 from app.utils.database import get_db_connection
+from app.utils.queries import execute
 from app.utils.auth import verify_password, generate_token, token_required
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/api/auth')
@@ -18,10 +19,7 @@ def login():
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute(
-                "SELECT id, username, password_hash FROM users WHERE username = %s",
-                (username,)
-            )
+            execute(cursor, 'user_by_username', (username,))
             user = cursor.fetchone()
             cursor.close()
             
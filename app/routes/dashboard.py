@@ -1,9 +1,63 @@
-from flask import Blueprint, jsonify
+import queue
+import threading
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from app.utils.database import get_db_connection
-from app.utils.auth import token_required
+from app.utils.queries import execute, get_stats as get_query_stats
+from app.utils.auth import token_required, decode_token
+from app.utils.events import (
+    DashboardBroker, HEARTBEAT_INTERVAL, DASHBOARD_MAX_STREAMS, STREAM_RETRY_AFTER,
+    DASHBOARD_RESUME_LIMIT, format_event, resume_event_id
+)
+from app.utils.serializers import serialize_distribution
+from datetime import datetime
 
 dashboard_bp = Blueprint('dashboard', __name__, url_prefix='/api/dashboard')
 
+# Vagas de stream deste worker; as threads restantes atendem as demais rotas
+stream_slots = threading.BoundedSemaphore(DASHBOARD_MAX_STREAMS)
+
+def compute_stats(cursor):
+    """Calcula as estatísticas gerais exibidas no dashboard."""
+    # Total de famílias
+    execute(cursor, 'families_count')
+    total_families = cursor.fetchone()['total']
+
+    # Total de doações (cestas recebidas)
+    execute(cursor, 'donations_total')
+    total_donations = cursor.fetchone()['total']
+
+    # Total de distribuições (cestas distribuídas)
+    execute(cursor, 'distributions_total')
+    total_distributions = cursor.fetchone()['total']
+
+    # Cestas disponíveis
+    available_baskets = total_donations - total_distributions
+
+    # Últimas distribuições
+    execute(cursor, 'distributions_recent')
+    recent_distributions = cursor.fetchall()
+
+    recent_dist_list = []
+    for dist in recent_distributions:
+        recent_dist_list.append({
+            'id': str(dist['id']),
+            'familyName': dist['family_name'],
+            'pickupPersonName': dist['pickup_person_name'],
+            'quantity': dist['quantity'],
+            'date': dist['date'].isoformat(),
+            'createdAt': dist['created_at'].isoformat()
+        })
+
+    return {
+        'totalFamilies': total_families,
+        'totalDonations': total_donations,
+        'totalDistributions': total_distributions,
+        'availableBaskets': available_baskets,
+        'recentDistributions': recent_dist_list
+    }
+
+broker = DashboardBroker(compute_stats)
+
 @dashboard_bp.route('/stats', methods=['GET'])
 @token_required
 def get_stats(current_user):
@@ -11,51 +65,107 @@ def get_stats(current_user):
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            
-            # Total de famílias
-            cursor.execute("SELECT COUNT(*) as total FROM families")
-            total_families = cursor.fetchone()['total']
-            
-            # Total de doações (cestas recebidas)
-            cursor.execute("SELECT COALESCE(SUM(quantity), 0) as total FROM donations")
-            total_donations = cursor.fetchone()['total']
-            
-            # Total de distribuições (cestas distribuídas)
-            cursor.execute("SELECT COALESCE(SUM(quantity), 0) as total FROM distributions")
-            total_distributions = cursor.fetchone()['total']
-            
-            # Cestas disponíveis
-            available_baskets = total_donations - total_distributions
-            
-            # Últimas distribuições
-            cursor.execute("""
-                SELECT id, family_name, pickup_person_name, quantity, date, created_at
-                FROM distributions
-                ORDER BY created_at DESC
-                LIMIT 5
-            """)
-            recent_distributions = cursor.fetchall()
-            
-            recent_dist_list = []
-            for dist in recent_distributions:
-                recent_dist_list.append({
-                    'id': str(dist['id']),
-                    'familyName': dist['family_name'],
-                    'pickupPersonName': dist['pickup_person_name'],
-                    'quantity': dist['quantity'],
-                    'date': dist['date'].isoformat(),
-                    'createdAt': dist['created_at'].isoformat()
-                })
-            
+            stats = compute_stats(cursor)
+            cursor.close()
+
+            return jsonify(stats), 200
+
+    except Exception as e:
+        return jsonify({'error': f'Erro ao buscar estatísticas: {str(e)}'}), 500
+
+@dashboard_bp.route('/queries', methods=['GET'])
+@token_required
+def get_queries(current_user):
+    """Retorna os contadores das consultas preparadas deste worker."""
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            stats = get_query_stats(cursor)
             cursor.close()
             
-            return jsonify({
-                'totalFamilies': total_families,
-                'totalDonations': total_donations,
-                'totalDistributions': total_distributions,
-                'availableBaskets': available_baskets,
-                'recentDistributions': recent_dist_list
-            }), 200
+            return jsonify(stats), 200
     
     except Exception as e:
-        return jsonify({'error': f'Erro ao buscar estatísticas: {str(e)}'}), 500
+        return jsonify({'error': f'Erro ao buscar estatísticas das consultas: {str(e)}'}), 500
+
+@dashboard_bp.route('/stream', methods=['GET'])
+def stream_stats():
+    """Envia as estatísticas e novas distribuições via Server-Sent Events.
+
+    O EventSource do navegador não envia cabeçalhos, então o token também
+    é aceito no parâmetro `token` (somente nesta rota, veja o README sobre
+    o token em logs). Cada worker aceita até DASHBOARD_MAX_STREAMS streams
+    ao mesmo tempo; os seguintes recebem 503.
+    """
+    token = request.args.get('token')
+    if 'Authorization' in request.headers:
+        try:
+            token = request.headers['Authorization'].split(' ')[1]
+        except IndexError:
+            return jsonify({'error': 'Token inválido'}), 401
+
+    if not token:
+        return jsonify({'error': 'Token não fornecido'}), 401
+
+    if not decode_token(token):
+        return jsonify({'error': 'Token inválido ou expirado'}), 401
+
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('lastEventId')
+    try:
+        resume_from = datetime.fromisoformat(last_event_id) if last_event_id else None
+    except ValueError:
+        resume_from = None
+
+    if not stream_slots.acquire(blocking=False):
+        response = jsonify({'error': 'Limite de conexões do dashboard atingido. Tente novamente em instantes.'})
+        return response, 503, {'Retry-After': str(STREAM_RETRY_AFTER)}
+
+    # Inscrever antes de buscar as perdidas: uma distribuição confirmada
+    # entre as duas coisas chega por um dos caminhos (talvez pelos dois)
+    subscriber = broker.subscribe()
+
+    # Distribuições criadas enquanto o cliente estava desconectado
+    missed, missed_id = [], None
+    if resume_from:
+        try:
+            with get_db_connection() as conn:
+                cursor = conn.cursor()
+                execute(cursor, 'sync_token')
+                token = cursor.fetchone()['token']
+                execute(cursor, 'distributions_created_since', (resume_from, DASHBOARD_RESUME_LIMIT))
+                rows = cursor.fetchall()
+                cursor.close()
+            missed = [serialize_distribution(dist) for dist in rows]
+            missed_id = resume_event_id(token, rows)
+        except Exception as e:
+            broker.unsubscribe(subscriber)
+            stream_slots.release()
+            return jsonify({'error': f'Erro ao retomar eventos: {str(e)}'}), 500
+
+    def generate():
+        try:
+            yield "retry: 5000\n\n"
+            for dist in missed:
+                yield format_event('distribution', dist, missed_id)
+            if broker.latest_stats is not None:
+                yield format_event('stats', broker.latest_stats, broker.latest_token)
+
+            while True:
+                try:
+                    event, data, event_id = subscriber.get(timeout=HEARTBEAT_INTERVAL)
+                except queue.Empty:
+                    yield ": heartbeat\n\n"
+                    continue
+                yield format_event(event, data, event_id)
+        finally:
+            broker.unsubscribe(subscriber)
+
+    response = Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+    # Chamado quando o servidor fecha a resposta, mesmo que o stream não
+    # tenha chegado a começar
+    response.call_on_close(stream_slots.release)
+    return response
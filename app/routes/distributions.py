@@ -1,6 +1,10 @@
 from flask import Blueprint, request, jsonify
 from app.utils.database import get_db_connection
+from app.utils.queries import execute
 from app.utils.auth import token_required
+from app.utils.partitions import parse_created_range
+from app.utils.events import notify_change
+from app.utils.audit import record_audit, audit_fields
 from datetime import datetime
 
 distributions_bp = Blueprint('distributions', __name__, url_prefix='/api/distributions')
@@ -8,16 +12,20 @@ distributions_bp = Blueprint('distributions', __name__, url_prefix='/api/distrib
 @distributions_bp.route('', methods=['GET'])
 @token_required
 def get_distributions(current_user):
-    """Lista todas as distribuições."""
+    """Lista todas as distribuições (opcionalmente entre as datas `from` e `to`)."""
+    try:
+        created_range = parse_created_range(request.args)
+    except ValueError:
+        return jsonify({'error': 'Período inválido'}), 400
+    
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
             
-            cursor.execute("""
-                SELECT id, family_id, family_name, pickup_person_name, quantity, date, created_at
-                FROM distributions
-                ORDER BY created_at DESC
-            """)
+            if created_range:
+                execute(cursor, 'distribution_list_between', created_range)
+            else:
+                execute(cursor, 'distribution_list')
             distributions = cursor.fetchall()
             
             result = []
@@ -51,10 +59,10 @@ def create_distribution(current_user):
             cursor = conn.cursor()
             
             # Verificar se há cestas suficientes em estoque
-            cursor.execute("SELECT COALESCE(SUM(quantity), 0) as total FROM donations")
+            execute(cursor, 'donations_total')
             total_donations = cursor.fetchone()['total']
             
-            cursor.execute("SELECT COALESCE(SUM(quantity), 0) as total FROM distributions")
+            execute(cursor, 'distributions_total')
             total_distributions = cursor.fetchone()['total']
             
             available = total_donations - total_distributions
@@ -65,11 +73,7 @@ def create_distribution(current_user):
             # Criar distribuição
             distribution_date = datetime.fromisoformat(data['date'].replace('Z', '+00:00')) if data.get('date') else datetime.now()
             
-            cursor.execute("""
-                INSERT INTO distributions (family_id, family_name, pickup_person_name, quantity, date)
-                VALUES (%s, %s, %s, %s, %s)
-                RETURNING id, created_at
-            """, (
+            execute(cursor, 'distribution_insert', (
                 data['familyId'],
                 data['familyName'],
                 data['pickupPersonName'],
@@ -78,10 +82,7 @@ def create_distribution(current_user):
             ))
             
             distribution = cursor.fetchone()
-            conn.commit()
-            cursor.close()
-            
-            return jsonify({
+            result = {
                 'id': str(distribution['id']),
                 'familyId': data['familyId'],
                 'familyName': data['familyName'],
@@ -89,7 +90,13 @@ def create_distribution(current_user):
                 'quantity': data['quantity'],
                 'date': distribution_date.isoformat(),
                 'createdAt': distribution['created_at'].isoformat()
-            }), 201
+            }
+            notify_change(cursor, 'distribution', result)
+            conn.commit()
+            cursor.close()
+            record_audit(current_user, 'create', 'distribution', distribution['id'], audit_fields(data))
+            
+            return jsonify(result), 201
     
     except Exception as e:
         return jsonify({'error': f'Erro ao criar distribuição: {str(e)}'}), 500
@@ -102,7 +109,7 @@ def get_total_distributions(current_user):
         with get_db_connection() as conn:
             cursor = conn.cursor()
             
-            cursor.execute("SELECT COALESCE(SUM(quantity), 0) as total FROM distributions")
+            execute(cursor, 'distributions_total')
             result = cursor.fetchone()
             
             cursor.close()
@@ -1,22 +1,30 @@
 from flask import Blueprint, request, jsonify
 from app.utils.database import get_db_connection
+from app.utils.queries import execute
 from app.utils.auth import token_required
+from app.utils.partitions import parse_created_range
+from app.utils.events import notify_change
+from app.utils.audit import record_audit, audit_fields
 
 donations_bp = Blueprint('donations', __name__, url_prefix='/api/donations')
 
 @donations_bp.route('', methods=['GET'])
 @token_required
 def get_donations(current_user):
-    """Lista todas as doações."""
+    """Lista todas as doações (opcionalmente entre as datas `from` e `to`)."""
+    try:
+        created_range = parse_created_range(request.args)
+    except ValueError:
+        return jsonify({'error': 'Período inválido'}), 400
+    
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
             
-            cursor.execute("""
-                SELECT id, responsible_name, cpf, phone, quantity, type, created_at
-                FROM donations
-                ORDER BY created_at DESC
-            """)
+            if created_range:
+                execute(cursor, 'donation_list_between', created_range)
+            else:
+                execute(cursor, 'donation_list')
             donations = cursor.fetchall()
             
             result = []
@@ -46,11 +54,7 @@ def create_donation(current_user):
         with get_db_connection() as conn:
             cursor = conn.cursor()
             
-            cursor.execute("""
-                INSERT INTO donations (responsible_name, cpf, phone, quantity, type)
-                VALUES (%s, %s, %s, %s, %s)
-                RETURNING id, created_at
-            """, (
+            execute(cursor, 'donation_insert', (
                 data['responsibleName'],
                 data.get('cpf', ''),
                 data.get('phone', ''),
@@ -59,8 +63,10 @@ def create_donation(current_user):
             ))
             
             donation = cursor.fetchone()
+            notify_change(cursor, 'donation')
             conn.commit()
             cursor.close()
+            record_audit(current_user, 'create', 'donation', donation['id'], audit_fields(data))
             
             return jsonify({
                 'id': str(donation['id']),
@@ -83,7 +89,7 @@ def get_total_donations(current_user):
         with get_db_connection() as conn:
             cursor = conn.cursor()
             
-            cursor.execute("SELECT COALESCE(SUM(quantity), 0) as total FROM donations")
+            execute(cursor, 'donations_total')
             result = cursor.fetchone()
             
             cursor.close()
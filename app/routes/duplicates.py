@@ -0,0 +1,63 @@
+from flask import Blueprint, request, jsonify
+from app.utils.database import get_db_connection
+from app.utils.queries import execute
+from app.utils.auth import token_required
+from app.utils.audit import record_audit
+from app.utils.dedupe import DUPLICATE_STATUSES
+from app.utils.serializers import serialize_duplicate
+
+duplicates_bp = Blueprint('duplicates', __name__, url_prefix='/api/duplicates')
+
+@duplicates_bp.route('', methods=['GET'])
+@token_required
+def get_duplicates(current_user):
+    """Fila de revisão: pares de famílias possivelmente duplicadas."""
+    status = request.args.get('status', 'pending')
+    if status not in DUPLICATE_STATUSES:
+        return jsonify({'error': f'Status inválido. Status: {", ".join(DUPLICATE_STATUSES)}'}), 400
+    
+    try:
+        limit = int(request.args.get('limit', 50))
+    except ValueError:
+        limit = 0
+    if not 1 <= limit <= 500:
+        return jsonify({'error': 'limit deve estar entre 1 e 500'}), 400
+    
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            execute(cursor, 'duplicates_by_status', (status, limit))
+            duplicates = cursor.fetchall()
+            cursor.close()
+            
+            return jsonify([serialize_duplicate(duplicate) for duplicate in duplicates]), 200
+    
+    except Exception as e:
+        return jsonify({'error': f'Erro ao buscar duplicatas: {str(e)}'}), 500
+
+@duplicates_bp.route('/<duplicate_id>', methods=['PUT'])
+@token_required
+def review_duplicate(current_user, duplicate_id):
+    """Marca um par como duplicata confirmada ou descartada."""
+    data = request.get_json()
+    
+    if not data or data.get('status') not in DUPLICATE_STATUSES:
+        return jsonify({'error': f'Status inválido. Status: {", ".join(DUPLICATE_STATUSES)}'}), 400
+    
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            execute(cursor, 'duplicate_review', (duplicate_id, data['status'], current_user['user_id']))
+            result = cursor.fetchone()
+            
+            if not result:
+                return jsonify({'error': 'Par não encontrado'}), 404
+            
+            conn.commit()
+            cursor.close()
+            record_audit(current_user, 'update', 'duplicate', duplicate_id, {'status': data['status']})
+            
+            return jsonify({'id': duplicate_id, 'status': result['status']}), 200
+    
+    except Exception as e:
+        return jsonify({'error': f'Erro ao revisar duplicata: {str(e)}'}), 500
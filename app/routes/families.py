@@ -1,6 +1,10 @@
 from flask import Blueprint, request, jsonify
 from app.utils.database import get_db_connection
+from app.utils.queries import execute
 from app.utils.auth import token_required
+from app.utils.events import notify_change
+from app.utils.audit import record_audit, audit_fields
+from app.jobs import enqueue
 from datetime import datetime
 
 families_bp = Blueprint('families', __name__, url_prefix='/api/families')
@@ -14,23 +18,19 @@ def get_families(current_user):
             cursor = conn.cursor()
             
             # Buscar todas as famílias
-            cursor.execute("""
-                SELECT id, name, father_name, mother_name, number_of_children,
-                       is_employed, receives_government_aid, government_aid_type,
-                       has_critical_factor, critical_factor_notes, created_at, updated_at
-                FROM families
-                ORDER BY created_at DESC
-            """)
+            execute(cursor, 'family_list')
             families = cursor.fetchall()
             
-            # Para cada família, buscar seus filhos
+            # Buscar os filhos de todas as famílias em uma única consulta
+            children_by_family = {}
+            if families:
+                execute(cursor, 'children_by_families', ([str(family['id']) for family in families],))
+                for child in cursor.fetchall():
+                    children_by_family.setdefault(str(child['family_id']), []).append(child)
+            
             result = []
             for family in families:
-                cursor.execute(
-                    "SELECT id, name, age FROM children WHERE family_id = %s",
-                    (family['id'],)
-                )
-                children = cursor.fetchall()
+                children = children_by_family.get(str(family['id']), [])
                 
                 family_dict = dict(family)
                 family_dict['id'] = str(family_dict['id'])
@@ -75,15 +75,7 @@ def create_family(current_user):
             cursor = conn.cursor()
             
             # Inserir família
-            cursor.execute("""
-                INSERT INTO families (
-                    name, father_name, mother_name, number_of_children,
-                    is_employed, receives_government_aid, government_aid_type,
-                    has_critical_factor, critical_factor_notes
-                )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                RETURNING id, created_at, updated_at
-            """, (
+            execute(cursor, 'family_insert', (
                 data['name'],
                 data.get('fatherName'),
                 data.get('motherName'),
@@ -102,11 +94,7 @@ def create_family(current_user):
             children = []
             if data.get('children'):
                 for child in data['children']:
-                    cursor.execute("""
-                        INSERT INTO children (family_id, name, age)
-                        VALUES (%s, %s, %s)
-                        RETURNING id, name, age
-                    """, (family_id, child['name'], child['age']))
+                    execute(cursor, 'child_insert', (family_id, child['name'], child['age']))
                     
                     child_data = cursor.fetchone()
                     children.append({
@@ -115,8 +103,12 @@ def create_family(current_user):
                         'age': child_data['age']
                     })
             
+            # Duplicatas verificadas pelo worker, sem atrasar o cadastro
+            enqueue(cursor, 'dedupe_family', {'familyId': family_id})
+            notify_change(cursor, 'family')
             conn.commit()
             cursor.close()
+            record_audit(current_user, 'create', 'family', family_id, audit_fields(data))
             
             return jsonify({
                 'id': family_id,
@@ -145,13 +137,7 @@ def get_family(current_user, family_id):
         with get_db_connection() as conn:
             cursor = conn.cursor()
             
-            cursor.execute("""
-                SELECT id, name, father_name, mother_name, number_of_children,
-                       is_employed, receives_government_aid, government_aid_type,
-                       has_critical_factor, critical_factor_notes, created_at, updated_at
-                FROM families
-                WHERE id = %s
-            """, (family_id,))
+            execute(cursor, 'family_by_id', (family_id,))
             
             family = cursor.fetchone()
             
@@ -159,10 +145,7 @@ def get_family(current_user, family_id):
                 return jsonify({'error': 'Família não encontrada'}), 404
             
             # Buscar filhos
-            cursor.execute(
-                "SELECT id, name, age FROM children WHERE family_id = %s",
-                (family_id,)
-            )
+            execute(cursor, 'children_by_family', (family_id,))
             children = cursor.fetchall()
             
             family_dict = dict(family)
@@ -203,16 +186,7 @@ def update_family(current_user, family_id):
             cursor = conn.cursor()
             
             # Atualizar família
-            cursor.execute("""
-                UPDATE families
-                SET name = %s, father_name = %s, mother_name = %s,
-                    number_of_children = %s, is_employed = %s,
-                    receives_government_aid = %s, government_aid_type = %s,
-                    has_critical_factor = %s, critical_factor_notes = %s,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE id = %s
-                RETURNING updated_at
-            """, (
+            execute(cursor, 'family_update', (
                 data.get('name'),
                 data.get('fatherName'),
                 data.get('motherName'),
@@ -230,16 +204,12 @@ def update_family(current_user, family_id):
                 return jsonify({'error': 'Família não encontrada'}), 404
             
             # Deletar filhos antigos e inserir novos
-            cursor.execute("DELETE FROM children WHERE family_id = %s", (family_id,))
+            execute(cursor, 'children_delete', (family_id,))
             
             children = []
             if data.get('children'):
                 for child in data['children']:
-                    cursor.execute("""
-                        INSERT INTO children (family_id, name, age)
-                        VALUES (%s, %s, %s)
-                        RETURNING id, name, age
-                    """, (family_id, child['name'], child['age']))
+                    execute(cursor, 'child_insert', (family_id, child['name'], child['age']))
                     
                     child_data = cursor.fetchone()
                     children.append({
@@ -248,8 +218,12 @@ def update_family(current_user, family_id):
                         'age': child_data['age']
                     })
             
+            # Duplicatas verificadas pelo worker, sem atrasar o cadastro
+            enqueue(cursor, 'dedupe_family', {'familyId': family_id})
+            notify_change(cursor, 'family')
             conn.commit()
             cursor.close()
+            record_audit(current_user, 'update', 'family', family_id, audit_fields(data))
             
             return jsonify({
                 'id': family_id,
@@ -277,14 +251,23 @@ def delete_family(current_user, family_id):
         with get_db_connection() as conn:
             cursor = conn.cursor()
             
-            cursor.execute("DELETE FROM families WHERE id = %s RETURNING id", (family_id,))
-            result = cursor.fetchone()
-            
-            if not result:
+            # Travar a família impede novas distribuições até o commit, então
+            # as distribuições lidas aqui são exatamente as removidas em cascata
+            execute(cursor, 'family_lock', (family_id,))
+            if not cursor.fetchone():
                 return jsonify({'error': 'Família não encontrada'}), 404
             
+            execute(cursor, 'distribution_ids_by_family', (family_id,))
+            distribution_ids = [str(row['id']) for row in cursor.fetchall()]
+            
+            execute(cursor, 'family_delete', (family_id,))
+            
+            notify_change(cursor, 'family')
             conn.commit()
             cursor.close()
+            record_audit(current_user, 'delete', 'family', family_id)
+            for distribution_id in distribution_ids:
+                record_audit(current_user, 'delete', 'distribution', distribution_id, {'familyId': family_id})
             
             return jsonify({'message': 'Família deletada com sucesso'}), 200
     
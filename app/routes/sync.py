@@ -0,0 +1,82 @@
+from flask import Blueprint, request, jsonify
+from app.utils.database import get_db_connection, SYNC_RETENTION_DAYS
+from app.utils.queries import execute
+from app.utils.auth import token_required
+from app.utils.serializers import serialize_family, serialize_donation, serialize_distribution
+from datetime import datetime, timedelta
+
+sync_bp = Blueprint('sync', __name__, url_prefix='/api/sync')
+
+@sync_bp.route('', methods=['GET'])
+@token_required
+def get_changes(current_user):
+    """Retorna as alterações feitas desde o token informado em `since`."""
+    since = None
+    if request.args.get('since'):
+        try:
+            since = datetime.fromisoformat(request.args['since'])
+        except ValueError:
+            return jsonify({'error': 'Token de sincronização inválido'}), 400
+
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+
+            # O próximo token é o início da transação mais antiga ainda
+            # aberta, mesmo que ela ainda não tenha escrito nada: as linhas
+            # são gravadas com CURRENT_TIMESTAMP (o início da transação), e
+            # uma transação que só lê antes do INSERT (ex.: a verificação de
+            # estoque de uma distribuição) não pode ficar de fora.
+            execute(cursor, 'sync_token')
+            token = cursor.fetchone()['token']
+
+            # Tokens mais antigos que a retenção dos tombstones exigem carga completa
+            if since and since < token - timedelta(days=SYNC_RETENTION_DAYS):
+                since = None
+
+            if since:
+                suffix, params = 'since', (since,)
+            else:
+                suffix, params = 'all', ()
+
+            # Famílias alteradas e seus filhos (uma única consulta para os filhos).
+            # Os filhos só são gravados junto com a família, na mesma transação,
+            # então basta o updated_at da família (usa idx_families_updated_at).
+            execute(cursor, f'sync_families_{suffix}', params)
+            families = cursor.fetchall()
+
+            children_by_family = {}
+            if families:
+                execute(cursor, 'children_by_families', ([str(family['id']) for family in families],))
+                for child in cursor.fetchall():
+                    children_by_family.setdefault(str(child['family_id']), []).append(child)
+
+            execute(cursor, f'sync_donations_{suffix}', params)
+            donations = cursor.fetchall()
+
+            execute(cursor, f'sync_distributions_{suffix}', params)
+            distributions = cursor.fetchall()
+
+            # Registros excluídos (inclusive em cascata)
+            deleted = {'families': [], 'children': [], 'donations': [], 'distributions': []}
+            if since:
+                execute(cursor, 'sync_tombstones_since', (since,))
+                for tombstone in cursor.fetchall():
+                    deleted.setdefault(tombstone['table_name'], []).append(str(tombstone['record_id']))
+
+            cursor.close()
+
+            return jsonify({
+                'token': token.isoformat(),
+                'full': since is None,
+                'families': [
+                    serialize_family(family, children_by_family.get(str(family['id']), []))
+                    for family in families
+                ],
+                'donations': [serialize_donation(donation) for donation in donations],
+                'distributions': [serialize_distribution(dist) for dist in distributions],
+                'deleted': deleted
+            }), 200
+
+    except Exception as e:
+        return jsonify({'error': f'Erro ao sincronizar dados: {str(e)}'}), 500
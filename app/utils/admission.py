@@ -0,0 +1,117 @@
+import os
+import threading
+import time
+from flask import g, request, jsonify
+from app.utils.events import DASHBOARD_MAX_STREAMS
+
+# Threads de cada worker do gunicorn (--threads)
+WEB_THREADS = int(os.getenv('WEB_THREADS', 32))
+
+# Requisições simultâneas por worker: as threads que sobram depois das
+# reservadas aos streams do dashboard (que ficam fora do controle)
+ADMISSION_CAPACITY = int(os.getenv('ADMISSION_CAPACITY', WEB_THREADS - DASHBOARD_MAX_STREAMS))
+
+# Classes de rota, da mais para a menos prioritária:
+#   concurrency       - fração da capacidade que a classe pode ocupar sozinha
+#   headroom          - fração da capacidade reservada às classes mais prioritárias
+#   wait              - segundos esperando uma vaga antes de recusar com 503
+#   statement_timeout - tempo máximo de cada consulta no Postgres (ms)
+#   retry_after       - valor do cabeçalho Retry-After (s) na recusa
+ROUTE_CLASSES = {
+    'critical': {'concurrency': 1.0, 'headroom': 0.0, 'wait': 2.0, 'statement_timeout': 5000, 'retry_after': 1},
+    'write': {'concurrency': 0.5, 'headroom': 0.1, 'wait': 0.5, 'statement_timeout': 10000, 'retry_after': 2},
+    'read': {'concurrency': 0.5, 'headroom': 0.25, 'wait': 0.2, 'statement_timeout': 10000, 'retry_after': 2},
+    'bulk': {'concurrency': 0.25, 'headroom': 0.5, 'wait': 0.0, 'statement_timeout': 30000, 'retry_after': 5},
+}
+
+# Classe de cada endpoint; os demais são 'read' (GET) ou 'write'
+ENDPOINT_CLASSES = {
+    'auth.login': 'critical',
+    'distributions.create_distribution': 'critical',
+    'families.get_families': 'bulk',
+    'donations.get_donations': 'bulk',
+    'distributions.get_distributions': 'bulk',
+    'sync.get_changes': 'bulk',
+    'audit.get_audit': 'bulk',
+    'duplicates.get_duplicates': 'bulk',
+}
+
+# Endpoints fora do controle: sem banco ou conexões longas (SSE)
+ADMISSION_EXEMPT = {'health_check', 'index', 'dashboard.stream_stats'}
+
+class AdmissionControl:
+    """Limita as requisições simultâneas por classe de rota.
+
+    Uma classe só é admitida enquanto tem vagas próprias e enquanto o total
+    em andamento deixa livre a folga (`headroom`) reservada às classes mais
+    prioritárias. Assim uma rajada de listagens grandes não impede o login
+    e o registro de distribuições. Sem vaga após `wait` segundos, a
+    requisição é recusada com 503 e Retry-After.
+    """
+
+    def __init__(self, classes=ROUTE_CLASSES, endpoints=ENDPOINT_CLASSES, capacity=ADMISSION_CAPACITY):
+        self.classes = classes
+        self.endpoints = endpoints
+        self.capacity = capacity
+        self.running = {name: 0 for name in classes}
+        self.total = 0
+        self.condition = threading.Condition()
+
+    def classify(self, endpoint, method):
+        """Classe de rota de uma requisição."""
+        if endpoint in self.endpoints:
+            return self.endpoints[endpoint]
+        return 'read' if method in ('GET', 'HEAD') else 'write'
+
+    def _has_room(self, name):
+        config = self.classes[name]
+        return (
+            self.running[name] < max(1, int(config['concurrency'] * self.capacity))
+            and self.total < max(1, int((1 - config['headroom']) * self.capacity))
+        )
+
+    def acquire(self, name, wait=None):
+        """Ocupa uma vaga da classe; retorna False se não houver vaga a tempo."""
+        deadline = time.monotonic() + (self.classes[name]['wait'] if wait is None else wait)
+        with self.condition:
+            while not self._has_room(name):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self.condition.wait(remaining)
+            self.running[name] += 1
+            self.total += 1
+            return True
+
+    def release(self, name):
+        """Libera a vaga ocupada por `acquire`."""
+        with self.condition:
+            self.running[name] -= 1
+            self.total -= 1
+            self.condition.notify_all()
+
+    def overloaded(self, name):
+        """Resposta de recusa (503) para a classe."""
+        retry_after = self.classes[name]['retry_after']
+        response = jsonify({'error': 'Servidor sobrecarregado. Tente novamente em instantes.'})
+        return response, 503, {'Retry-After': str(retry_after)}
+
+    def init_app(self, app):
+        """Aplica o controle de admissão às rotas de uma aplicação Flask."""
+        @app.before_request
+        def admit():
+            if request.method == 'OPTIONS' or request.endpoint in (None, *ADMISSION_EXEMPT):
+                return None
+            name = self.classify(request.endpoint, request.method)
+            if not self.acquire(name):
+                return self.overloaded(name)
+            g.route_class = name
+            # Aplicado por get_db_connection em cada conexão emprestada
+            g.statement_timeout = self.classes[name]['statement_timeout']
+            return None
+
+        @app.teardown_request
+        def release(exc):
+            name = g.pop('route_class', None)
+            if name:
+                self.release(name)
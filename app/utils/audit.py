@@ -0,0 +1,133 @@
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from psycopg2.extras import execute_values
+from app.utils.database import get_db_connection
+from app.utils.partitions import parse_datetime
+
+# Eventos acumulados antes de uma gravação imediata
+AUDIT_BATCH_SIZE = int(os.getenv('AUDIT_BATCH_SIZE', 100))
+
+# Intervalo máximo (em segundos) entre gravações
+AUDIT_FLUSH_INTERVAL = float(os.getenv('AUDIT_FLUSH_INTERVAL', 2))
+
+# Limite de eventos em memória se o banco ficar indisponível
+AUDIT_MAX_BUFFER = int(os.getenv('AUDIT_MAX_BUFFER', 10000))
+
+# Maior id possível: primeira página da paginação
+AUDIT_FIRST_PAGE = 2 ** 63 - 1
+
+class AuditBuffer:
+    """Acumula eventos de auditoria em memória e grava em lote.
+
+    `record` só adiciona o evento à lista; uma thread grava os eventos com
+    um INSERT de várias linhas quando o lote enche, a cada
+    AUDIT_FLUSH_INTERVAL segundos e ao encerrar o processo.
+    """
+
+    def __init__(self, batch_size=AUDIT_BATCH_SIZE, flush_interval=AUDIT_FLUSH_INTERVAL):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._events = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def _start(self):
+        # Cada processo (worker do gunicorn) precisa da sua própria thread
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._events = []
+            self._thread = threading.Thread(target=self._run, name='audit-flusher', daemon=True)
+            self._thread.start()
+
+    def record(self, current_user, action, entity_type, entity_id, details=None):
+        """Registra um evento de auditoria sem acessar o banco."""
+        event = (
+            time.time(),
+            current_user.get('user_id') if current_user else None,
+            current_user.get('username') if current_user else None,
+            action,
+            entity_type,
+            str(entity_id) if entity_id else None,
+            json.dumps(details) if details is not None else None
+        )
+        with self._lock:
+            self._start()
+            self._events.append(event)
+            if len(self._events) > AUDIT_MAX_BUFFER:
+                # Banco indisponível por muito tempo: descartar os mais antigos
+                del self._events[:len(self._events) - AUDIT_MAX_BUFFER]
+            full = len(self._events) >= self.batch_size
+        if full:
+            self._wakeup.set()
+
+    def flush(self):
+        """Grava no banco todos os eventos pendentes."""
+        with self._flush_lock:
+            with self._lock:
+                events, self._events = self._events, []
+            if not events:
+                return
+
+            try:
+                with get_db_connection() as conn:
+                    cursor = conn.cursor()
+                    # to_timestamp: o instante da ação, no mesmo fuso de CURRENT_TIMESTAMP
+                    execute_values(cursor, """
+                        INSERT INTO audit_log
+                            (occurred_at, user_id, username, action, entity_type, entity_id, details)
+                        VALUES %s
+                    """, events, template='(to_timestamp(%s), %s, %s, %s, %s, %s, %s::jsonb)', page_size=500)
+                    cursor.close()
+            except Exception as e:
+                # Devolver os eventos para a próxima tentativa
+                with self._lock:
+                    self._events[:0] = events
+                    del self._events[:max(len(self._events) - AUDIT_MAX_BUFFER, 0)]
+                print(f"✗ Erro ao gravar auditoria ({len(events)} eventos pendentes): {e}")
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+audit_buffer = AuditBuffer()
+atexit.register(audit_buffer.flush)
+
+def record_audit(current_user, action, entity_type, entity_id, details=None):
+    """Registra uma ação (create, update, delete) do usuário autenticado."""
+    audit_buffer.record(current_user, action, entity_type, entity_id, details)
+
+def audit_fields(data):
+    """Detalhes de auditoria de um corpo de requisição: só os nomes dos
+    campos enviados, sem os valores (CPF, telefone, dados das famílias)."""
+    return {'fields': sorted(data or {})}
+
+def parse_audit_filters(args):
+    """Lê os filtros da trilha de auditoria e escolhe a consulta.
+
+    Retorna (nome da consulta, parâmetros, limite). Levanta ValueError
+    para filtros inválidos.
+    """
+    limit = int(args.get('limit', 50))
+    if not 1 <= limit <= 500:
+        raise ValueError('limit deve estar entre 1 e 500')
+    before = int(args.get('before', AUDIT_FIRST_PAGE))
+    since = parse_datetime(args['since']) if args.get('since') else datetime.min
+    params = (before, since, limit)
+
+    if args.get('entityId'):
+        if not args.get('entityType'):
+            raise ValueError('entityType é obrigatório junto com entityId')
+        return 'audit_by_entity', params + (args['entityType'], str(uuid.UUID(args['entityId']))), limit
+    if args.get('userId'):
+        return 'audit_by_user', params + (str(uuid.UUID(args['userId'])),), limit
+    return 'audit_recent', params, limit
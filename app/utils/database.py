@@ -1,25 +1,128 @@
 import os
+import threading
 import psycopg2
+from psycopg2.extensions import connection as BaseConnection
 from psycopg2.extras import RealDictCursor
+from psycopg2.pool import ThreadedConnectionPool, PoolError
 from contextlib import contextmanager
+from flask import g, has_app_context
 
 DATABASE_URL = os.getenv('DATABASE_URL')
 
+# Por quantos dias os registros de exclusão ficam disponíveis para sincronização
+SYNC_RETENTION_DAYS = int(os.getenv('SYNC_RETENTION_DAYS', 90))
+
+# Tamanho do pool de conexões (por processo/worker)
+DB_POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', 1))
+DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', 32))
+
+# Tempo máximo (em segundos) esperando uma conexão livre no pool
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 10))
+
+# statement_timeout (ms) fora das rotas da API (worker, comandos); 0 = sem limite
+DB_STATEMENT_TIMEOUT = int(os.getenv('DB_STATEMENT_TIMEOUT', 0))
+
+class PreparedConnection(BaseConnection):
+    """Conexão que guarda quais prepared statements já foram criados nela
+    e o statement_timeout configurado na sessão."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared_statements = set()
+        self.statement_timeout = None
+
+class BlockingConnectionPool(ThreadedConnectionPool):
+    """Pool que espera por uma conexão livre em vez de falhar quando esgotado."""
+
+    def __init__(self, minconn, maxconn, *args, **kwargs):
+        super().__init__(minconn, maxconn, *args, **kwargs)
+        self._available = threading.BoundedSemaphore(maxconn)
+
+    def getconn(self, key=None):
+        if not self._available.acquire(timeout=DB_POOL_TIMEOUT):
+            raise PoolError('Tempo esgotado aguardando conexão com o banco')
+        try:
+            return super().getconn(key)
+        except Exception:
+            self._available.release()
+            raise
+
+    def putconn(self, conn=None, key=None, close=False):
+        try:
+            super().putconn(conn, key, close)
+        finally:
+            self._available.release()
+
+# Keepalives detectam conexões ociosas derrubadas pelo servidor
+CONNECTION_OPTIONS = {
+    'cursor_factory': RealDictCursor,
+    'connection_factory': PreparedConnection,
+    'keepalives': 1,
+    'keepalives_idle': 30,
+    'keepalives_interval': 10,
+    'keepalives_count': 3
+}
+
+def connect():
+    """Abre uma nova conexão com o banco, fora do pool."""
+    return psycopg2.connect(DATABASE_URL, **CONNECTION_OPTIONS)
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    """Retorna o pool do processo atual (cada worker do gunicorn tem o seu)."""
+    global _pool, _pool_pid
+    if _pool is None or _pool_pid != os.getpid():
+        with _pool_lock:
+            if _pool is None or _pool_pid != os.getpid():
+                _pool = BlockingConnectionPool(
+                    DB_POOL_MIN_SIZE,
+                    DB_POOL_MAX_SIZE,
+                    DATABASE_URL,
+                    **CONNECTION_OPTIONS
+                )
+                _pool_pid = os.getpid()
+    return _pool
+
+def apply_statement_timeout(conn):
+    """Ajusta o statement_timeout da conexão para a classe da rota atual.
+
+    O valor vem de `g.statement_timeout` (definido pelo controle de
+    admissão). O SET só é enviado quando muda em relação ao último uso da
+    conexão, e é confirmado para não ser desfeito por um rollback.
+    """
+    timeout = g.get('statement_timeout', DB_STATEMENT_TIMEOUT) if has_app_context() else DB_STATEMENT_TIMEOUT
+    if conn.statement_timeout != timeout:
+        cursor = conn.cursor()
+        cursor.execute("SET statement_timeout = %s", (timeout,))
+        cursor.close()
+        conn.commit()
+        conn.statement_timeout = timeout
+
 @contextmanager
 def get_db_connection():
-    """Context manager para conexão com o banco de dados."""
-    conn = psycopg2.connect(DATABASE_URL, cursor_factory=RealDictCursor)
+    """Context manager para conexão com o banco de dados (emprestada do pool)."""
+    pool = get_pool()
+    conn = pool.getconn()
     try:
+        apply_statement_timeout(conn)
         yield conn
         conn.commit()
     except Exception as e:
-        conn.rollback()
+        if not conn.closed:
+            conn.rollback()
         raise e
     finally:
-        conn.close()
+        # Conexões perdidas são descartadas; o pool abre outra (e os
+        # prepared statements são recriados nela) na próxima requisição
+        pool.putconn(conn, close=bool(conn.closed))
 
 def init_db():
     """Inicializa o banco de dados criando as tabelas necessárias."""
+    from app.utils.partitions import PARTITIONED_TABLES, ensure_partitions, migrate_to_partitioned
+
     with get_db_connection() as conn:
         cursor = conn.cursor()
         
@@ -61,32 +164,171 @@ def init_db():
             )
         """)
         
-        # Tabela de doações
-        cursor.execute("""
+        # Tabela de doações (particionada por mês em created_at)
+        donations_sql = """
             CREATE TABLE IF NOT EXISTS donations (
-                id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+                id UUID NOT NULL DEFAULT gen_random_uuid(),
                 responsible_name VARCHAR(255) NOT NULL,
                 cpf VARCHAR(14) NOT NULL,
                 phone VARCHAR(20) NOT NULL,
                 quantity INTEGER NOT NULL,
                 type VARCHAR(50) DEFAULT 'entry',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
+                created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (id, created_at)
+            ) PARTITION BY RANGE (created_at)
+        """
+        cursor.execute(donations_sql)
         
-        # Tabela de distribuições
-        cursor.execute("""
+        # Tabela de distribuições (particionada por mês em created_at)
+        distributions_sql = """
             CREATE TABLE IF NOT EXISTS distributions (
-                id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+                id UUID NOT NULL DEFAULT gen_random_uuid(),
                 family_id UUID REFERENCES families(id) ON DELETE CASCADE,
                 family_name VARCHAR(255) NOT NULL,
                 pickup_person_name VARCHAR(255) NOT NULL,
                 quantity INTEGER NOT NULL,
                 date TIMESTAMP NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (id, created_at)
+            ) PARTITION BY RANGE (created_at)
+        """
+        cursor.execute(distributions_sql)
+
+        # Colunas de controle para a sincronização incremental
+        for table in ('children', 'donations', 'distributions'):
+            cursor.execute(
+                f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP"
+            )
+
+        # Bancos criados antes do particionamento: converter as tabelas
+        migrate_to_partitioned(cursor, 'donations', donations_sql)
+        migrate_to_partitioned(cursor, 'distributions', distributions_sql)
+        for table in PARTITIONED_TABLES:
+            cursor.execute(f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT")
+            ensure_partitions(cursor, table)
+
+        # Totais das partições já arquivadas (mantêm o estoque correto)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS archived_partitions (
+                id BIGSERIAL PRIMARY KEY,
+                table_name VARCHAR(50) NOT NULL,
+                partition_name VARCHAR(100) UNIQUE NOT NULL,
+                range_start DATE NOT NULL,
+                range_end DATE NOT NULL,
+                row_count BIGINT NOT NULL,
+                total_quantity BIGINT NOT NULL,
+                file_path TEXT NOT NULL,
+                archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
-        
+
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_families_updated_at ON families (updated_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_children_family_id ON children (family_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_donations_updated_at ON donations (updated_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_distributions_updated_at ON distributions (updated_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_distributions_created_at ON distributions (created_at)")
+        # Exclusão em cascata e auditoria das distribuições de uma família removida
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_distributions_family_id ON distributions (family_id)")
+
+        # Tabela de registros excluídos (tombstones) para a sincronização
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS tombstones (
+                id BIGSERIAL PRIMARY KEY,
+                table_name VARCHAR(50) NOT NULL,
+                record_id UUID NOT NULL,
+                deleted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_tombstones_deleted_at ON tombstones (deleted_at)")
+
+        # Triggers de exclusão: também disparam nas exclusões em cascata
+        # (filhos e distribuições de uma família removida)
+        cursor.execute("""
+            CREATE OR REPLACE FUNCTION record_tombstone() RETURNS trigger AS $$
+            BEGIN
+                INSERT INTO tombstones (table_name, record_id) VALUES (TG_ARGV[0], OLD.id);
+                RETURN OLD;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+        for table in ('families', 'children', 'donations', 'distributions'):
+            cursor.execute(f"DROP TRIGGER IF EXISTS trg_{table}_tombstone ON {table}")
+            cursor.execute(f"""
+                CREATE TRIGGER trg_{table}_tombstone
+                AFTER DELETE ON {table}
+                FOR EACH ROW EXECUTE FUNCTION record_tombstone('{table}')
+            """)
+
+        # Fila de jobs em segundo plano (exportações, importações, relatórios)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+                type VARCHAR(50) NOT NULL,
+                status VARCHAR(20) NOT NULL DEFAULT 'queued',
+                params JSONB NOT NULL DEFAULT '{}',
+                progress INTEGER NOT NULL DEFAULT 0,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL DEFAULT 3,
+                run_after TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                result_path TEXT,
+                error TEXT,
+                created_by UUID,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                started_at TIMESTAMP,
+                heartbeat_at TIMESTAMP,
+                finished_at TIMESTAMP
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_queued ON jobs (run_after) WHERE status = 'queued'")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_running ON jobs (heartbeat_at) WHERE status = 'running'")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_jobs_created_by ON jobs (created_by, created_at)")
+
+        # Detecção de famílias duplicadas: chaves de bloco e fila de revisão
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS family_blocks (
+                key TEXT NOT NULL,
+                family_id UUID NOT NULL REFERENCES families(id) ON DELETE CASCADE,
+                PRIMARY KEY (key, family_id)
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_family_blocks_family_id ON family_blocks (family_id)")
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS duplicate_candidates (
+                id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+                family_id UUID NOT NULL REFERENCES families(id) ON DELETE CASCADE,
+                duplicate_id UUID NOT NULL REFERENCES families(id) ON DELETE CASCADE,
+                score REAL NOT NULL,
+                reasons JSONB NOT NULL DEFAULT '{}',
+                status VARCHAR(20) NOT NULL DEFAULT 'pending',
+                reviewed_by UUID,
+                reviewed_at TIMESTAMP,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE (family_id, duplicate_id)
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_duplicate_candidates_status ON duplicate_candidates (status, score DESC)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_duplicate_candidates_duplicate_id ON duplicate_candidates (duplicate_id)")
+
+        # Trilha de auditoria (gravada em lote por app.utils.audit)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS audit_log (
+                id BIGSERIAL PRIMARY KEY,
+                occurred_at TIMESTAMP NOT NULL,
+                user_id UUID,
+                username VARCHAR(255),
+                action VARCHAR(20) NOT NULL,
+                entity_type VARCHAR(50) NOT NULL,
+                entity_id UUID,
+                details JSONB
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_audit_log_entity ON audit_log (entity_type, entity_id, id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_audit_log_user ON audit_log (user_id, id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_audit_log_occurred_at ON audit_log USING BRIN (occurred_at)")
+
         # Criar usuário padrão (admin/admin123) se não existir
         cursor.execute("SELECT COUNT(*) FROM users WHERE username = 'admin'")
         if cursor.fetchone()['count'] == 0:
@@ -0,0 +1,184 @@
+import json
+import os
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from app.utils.queries import execute
+
+# Pontuação mínima (0 a 1) para um par entrar na fila de revisão
+DEDUPE_THRESHOLD = float(os.getenv('DEDUPE_THRESHOLD', 0.8))
+
+# Blocos maiores que isso (ex.: "silva", "maria") não geram candidatos
+DEDUPE_MAX_BLOCK = int(os.getenv('DEDUPE_MAX_BLOCK', 500))
+
+# Candidatos pontuados por família (os que compartilham mais chaves)
+DEDUPE_MAX_CANDIDATES = int(os.getenv('DEDUPE_MAX_CANDIDATES', 50))
+
+# Sinais (nome, pai, mãe, filhos) presentes nas duas famílias para um par
+# ir para a revisão: só o nome ("Silva" e "Silva") não basta
+DEDUPE_MIN_SIGNALS = 2
+
+# Situações de um par na fila de revisão
+DUPLICATE_STATUSES = ('pending', 'confirmed', 'dismissed')
+
+# Palavras ignoradas nos nomes
+STOPWORDS = {'da', 'das', 'de', 'do', 'dos', 'e', 'familia'}
+
+# Grafias com o mesmo som, aplicadas em ordem ("G" marca o g duro de gue/gui)
+PHONETIC_RULES = [
+    ('ph', 'f'), ('th', 't'), ('ch', 'x'), ('sh', 'x'), ('lh', 'l'), ('nh', 'n'),
+    ('sce', 'se'), ('sci', 'si'), ('xce', 'se'), ('xci', 'si'), ('cao', 'sao'),
+    ('que', 'ke'), ('qui', 'ki'), ('gue', 'Ge'), ('gui', 'Gi'),
+    ('ce', 'se'), ('ci', 'si'), ('ge', 'je'), ('gi', 'ji'), ('G', 'g'),
+    ('c', 'k'), ('q', 'k'), ('z', 's'), ('y', 'i'), ('w', 'v'), ('h', ''),
+]
+
+def fold(text):
+    """Minúsculas, sem acentos e sem pontuação ("Gonçalves" -> "goncalves")."""
+    text = (text or '').lower()
+    text = ''.join(char for char in unicodedata.normalize('NFKD', text) if not unicodedata.combining(char))
+    return re.sub(r'[^a-z0-9 ]+', ' ', text)
+
+def tokens(text):
+    """Palavras significativas de um nome, sem acentos."""
+    return [token for token in fold(text).split() if len(token) > 1 and token not in STOPWORDS]
+
+def phonetic(token):
+    """Código fonético simples para nomes em português.
+
+    Grafias com o mesmo som ("Souza"/"Sousa", "Thiago"/"Tiago",
+    "Raphael"/"Rafael") geram o mesmo código. Recebe o token já sem
+    acentos, então "Gonçalves" e "Goncalves" também coincidem.
+    """
+    for old, new in PHONETIC_RULES:
+        token = token.replace(old, new)
+    return re.sub(r'(.)\1+', r'\1', token)
+
+def first_name(name):
+    """Código fonético do primeiro nome, ou None."""
+    parts = tokens(name)
+    return phonetic(parts[0]) if parts else None
+
+def blocking_keys(family, children):
+    """Chaves de bloco de uma família.
+
+    Só famílias que compartilham pelo menos uma chave são comparadas.
+    """
+    keys = set()
+    for token in tokens(family['name']):
+        keys.add(f"n:{phonetic(token)}")
+        keys.add(f"a:{token}")
+    for parent in (family['father_name'], family['mother_name']):
+        parts = tokens(parent)
+        if parts:
+            keys.add(f"p:{phonetic(parts[0])}:{phonetic(parts[-1])}")
+    for child in children:
+        name = first_name(child['name'])
+        if name:
+            keys.add(f"c:{name}:{child['age']}")
+    return keys
+
+def similarity(a, b):
+    """Semelhança entre dois nomes (0 a 1), ignorando grafia e acentos."""
+    a = ' '.join(phonetic(token) for token in tokens(a))
+    b = ' '.join(phonetic(token) for token in tokens(b))
+    if not a or not b:
+        return None
+    return SequenceMatcher(None, a, b).ratio()
+
+def score_pair(family, children, other, other_children):
+    """Pontua um par de famílias e devolve (pontuação, motivos)."""
+    weights = {'name': 0.4, 'fatherName': 0.15, 'motherName': 0.15, 'children': 0.3}
+    reasons = {
+        'name': similarity(family['name'], other['name']),
+        'fatherName': similarity(family['father_name'], other['father_name']),
+        'motherName': similarity(family['mother_name'], other['mother_name']),
+        'children': None
+    }
+
+    if children and other_children:
+        # Filhos com o mesmo primeiro nome e idade próxima (cadastros em anos diferentes)
+        pending = [(first_name(child['name']), child['age'] or 0) for child in other_children]
+        matched = 0
+        for child in children:
+            name, age = first_name(child['name']), child['age'] or 0
+            for candidate in pending:
+                if name and candidate[0] == name and abs(candidate[1] - age) <= 1:
+                    pending.remove(candidate)
+                    matched += 1
+                    break
+        reasons['children'] = 2 * matched / (len(children) + len(other_children))
+
+    present = {key: value for key, value in reasons.items() if value is not None}
+    if not present:
+        return 0.0, {}
+    score = sum(weights[key] * value for key, value in present.items()) / sum(weights[key] for key in present)
+    return round(score, 3), {key: round(value, 3) for key, value in present.items()}
+
+def is_candidate(score, reasons):
+    """Se um par pontuado deve entrar na fila de revisão."""
+    return len(reasons) >= DEDUPE_MIN_SIGNALS and score >= DEDUPE_THRESHOLD
+
+def load_families(cursor, family_ids):
+    """Famílias e filhos por id: ({id: família}, {id: [filhos]})."""
+    execute(cursor, 'families_by_ids', (family_ids,))
+    families = {str(family['id']): family for family in cursor.fetchall()}
+    children = {}
+    if families:
+        execute(cursor, 'children_by_families', (list(families),))
+        for child in cursor.fetchall():
+            children.setdefault(str(child['family_id']), []).append(child)
+    return families, children
+
+def check_families(cursor, family_ids):
+    """Atualiza as chaves de bloco das famílias e registra possíveis duplicatas.
+
+    Cada família é comparada apenas com as que compartilham um bloco.
+    Devolve quantos pares foram registrados para revisão.
+    """
+    # Uma verificação por vez: duas famílias cadastradas ao mesmo tempo
+    # precisam enxergar as chaves uma da outra
+    execute(cursor, 'dedupe_lock')
+
+    families, children = load_families(cursor, family_ids)
+    if not families:
+        return 0
+
+    # Chaves de bloco (substitui as anteriores, o nome pode ter mudado)
+    key_list, owner_list = [], []
+    for family_id, family in families.items():
+        for key in blocking_keys(family, children.get(family_id, [])):
+            key_list.append(key)
+            owner_list.append(family_id)
+    execute(cursor, 'family_blocks_delete', (list(families),))
+    execute(cursor, 'family_blocks_insert', (key_list, owner_list))
+
+    execute(cursor, 'family_block_candidates', (key_list, owner_list, DEDUPE_MAX_BLOCK, DEDUPE_MAX_CANDIDATES))
+    pairs = {
+        tuple(sorted((str(row['family_id']), str(row['candidate_id']))))
+        for row in cursor.fetchall()
+    }
+    if not pairs:
+        return 0
+
+    missing = list({family_id for pair in pairs for family_id in pair} - set(families))
+    if missing:
+        others, other_children = load_families(cursor, missing)
+        families.update(others)
+        children.update(other_children)
+
+    found = ([], [], [], [])
+    for family_id, duplicate_id in pairs:
+        if family_id not in families or duplicate_id not in families:
+            continue
+        score, reasons = score_pair(
+            families[family_id], children.get(family_id, []),
+            families[duplicate_id], children.get(duplicate_id, [])
+        )
+        if is_candidate(score, reasons):
+            for column, value in zip(found, (family_id, duplicate_id, score, json.dumps(reasons))):
+                column.append(value)
+
+    if found[0]:
+        execute(cursor, 'duplicate_upsert', found)
+    return len(found[0])
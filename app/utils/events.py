@@ -0,0 +1,168 @@
+import json
+import os
+import queue
+import select
+import threading
+import time
+from app.utils.database import connect
+from app.utils.queries import execute
+
+# Canal do Postgres usado para avisar sobre alterações que afetam o dashboard
+DASHBOARD_CHANNEL = 'dashboard_events'
+
+# Intervalo (em segundos) entre os heartbeats do stream SSE
+HEARTBEAT_INTERVAL = 15
+
+# Streams SSE simultâneos por worker síncrono: cada um ocupa uma thread
+# do gunicorn enquanto estiver aberto
+DASHBOARD_MAX_STREAMS = int(os.getenv('DASHBOARD_MAX_STREAMS', 8))
+
+# Retry-After (s) quando não há vaga para um novo stream
+STREAM_RETRY_AFTER = 30
+
+# Distribuições reenviadas de uma vez ao retomar um stream
+DASHBOARD_RESUME_LIMIT = 100
+
+def notify_change(cursor, kind, data=None):
+    """Publica uma alteração no canal do dashboard.
+
+    O NOTIFY só é entregue quando a transação do cursor é confirmada,
+    então chamadas antes do commit nunca anunciam dados que foram desfeitos.
+    """
+    payload = json.dumps({'type': kind, 'data': data})
+    execute(cursor, 'notify_change', (DASHBOARD_CHANNEL, payload))
+
+def format_event(event, data, event_id=None):
+    """Formata um evento no protocolo Server-Sent Events.
+
+    O id do evento é o token de retomada (Last-Event-ID); sem id, o
+    navegador mantém o último recebido.
+    """
+    event_id = f"id: {event_id}\n" if event_id else ''
+    return f"{event_id}event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def resume_event_id(token, rows):
+    """Token de retomada depois de reenviar as distribuições perdidas.
+
+    O token vem de `sync_token`, lido antes das distribuições. Se a consulta
+    parou no limite, o cliente ainda não recebeu as linhas seguintes, então
+    o token volta para o created_at da última linha enviada.
+    """
+    if len(rows) >= DASHBOARD_RESUME_LIMIT:
+        token = min(token, rows[-1]['created_at'])
+    return token.isoformat()
+
+class DashboardBroker:
+    """Distribui os eventos do dashboard para todas as conexões SSE do worker.
+
+    Cada processo mantém uma única conexão com LISTEN; a cada rajada de
+    notificações as estatísticas são recalculadas uma vez e repassadas a
+    todos os inscritos, independente de quantas abas estejam abertas.
+
+    O id dos eventos é o token de sincronização (`sync_token`), e não o
+    created_at da última distribuição: created_at é o início da transação,
+    e uma transação que começou antes pode ser confirmada depois. Todas as
+    distribuições confirmadas antes da leitura do token já foram publicadas
+    quando o evento de estatísticas com esse token sai, e as demais têm
+    created_at igual ou posterior a ele.
+    """
+
+    def __init__(self, compute_stats, debounce=0.2, queue_size=100):
+        self.compute_stats = compute_stats
+        self.debounce = debounce
+        self.queue_size = queue_size
+        self.latest_stats = None
+        self.latest_token = None
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def subscribe(self):
+        """Registra um novo inscrito e devolve sua fila de eventos."""
+        subscriber = queue.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._subscribers.add(subscriber)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._listen, name='dashboard-listener', daemon=True)
+                self._thread.start()
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def publish(self, event, data, event_id=None):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.put_nowait((event, data, event_id))
+            except queue.Full:
+                # Cliente lento: ele recebe as estatísticas completas no próximo evento
+                pass
+
+    def _sync_token(self, conn):
+        cursor = conn.cursor()
+        execute(cursor, 'sync_token')
+        token = cursor.fetchone()['token'].isoformat()
+        cursor.close()
+        return token
+
+    def _refresh_stats(self, conn, token):
+        cursor = conn.cursor()
+        stats = self.compute_stats(cursor)
+        cursor.close()
+        self.latest_stats, self.latest_token = stats, token
+        self.publish('stats', stats, token)
+
+    def _listen(self):
+        backoff = 1
+        while True:
+            conn = None
+            try:
+                conn = connect()
+                conn.autocommit = True
+                cursor = conn.cursor()
+                cursor.execute(f"LISTEN {DASHBOARD_CHANNEL}")
+                cursor.close()
+
+                # Eventos podem ter sido perdidos enquanto estávamos desconectados
+                self._refresh_stats(conn, self._sync_token(conn))
+                backoff = 1
+
+                while True:
+                    if select.select([conn], [], [], 60) == ([], [], []):
+                        # Sem notificações: confirmar que a conexão continua viva
+                        conn.cursor().execute("SELECT 1")
+                        continue
+                    conn.poll()
+                    if not conn.notifies:
+                        continue
+
+                    # Agrupar as notificações que chegarem logo em seguida
+                    time.sleep(self.debounce)
+
+                    # Token lido antes de esvaziar a fila: as notificações das
+                    # transações confirmadas até aqui chegam junto com a resposta
+                    token = self._sync_token(conn)
+                    conn.poll()
+                    notifications = conn.notifies[:]
+                    del conn.notifies[:]
+
+                    # As distribuições levam o token anterior: o cliente que
+                    # desconectar no meio da rajada recebe o restante ao retomar
+                    for notification in notifications:
+                        try:
+                            message = json.loads(notification.payload)
+                        except ValueError:
+                            continue
+                        if message.get('type') == 'distribution' and message.get('data'):
+                            self.publish('distribution', message['data'], self.latest_token)
+
+                    self._refresh_stats(conn, token)
+            except Exception as e:
+                print(f"✗ Listener do dashboard desconectado: {e}")
+                if conn is not None and not conn.closed:
+                    conn.close()
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30)
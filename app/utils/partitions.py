@@ -0,0 +1,232 @@
+import gzip
+import os
+import click
+from datetime import date, datetime
+from app.utils.database import get_db_connection
+
+# Tabelas particionadas por mês em created_at, com as colunas na ordem da tabela
+PARTITIONED_TABLES = {
+    'donations': [
+        'id', 'responsible_name', 'cpf', 'phone', 'quantity', 'type', 'created_at', 'updated_at'
+    ],
+    'distributions': [
+        'id', 'family_id', 'family_name', 'pickup_person_name', 'quantity', 'date', 'created_at', 'updated_at'
+    ],
+}
+
+# Quantos meses à frente devem sempre ter partição criada
+PARTITION_MONTHS_AHEAD = int(os.getenv('PARTITION_MONTHS_AHEAD', 3))
+
+# Partições mais antigas que isso (em meses) são arquivadas
+PARTITION_RETENTION_MONTHS = int(os.getenv('PARTITION_RETENTION_MONTHS', 24))
+
+# Diretório onde as partições arquivadas são gravadas
+PARTITION_ARCHIVE_DIR = os.getenv('PARTITION_ARCHIVE_DIR', 'archive')
+
+def add_months(month, count):
+    """Soma `count` meses ao primeiro dia de um mês."""
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+def partition_name(table, month):
+    return f"{table}_{month.year:04d}_{month.month:02d}"
+
+def create_partition(cursor, table, month):
+    """Cria a partição mensal de `table` para `month`, se ainda não existir."""
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {partition_name(table, month)}
+        PARTITION OF {table}
+        FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')
+    """)
+
+def ensure_partitions(cursor, table, months_ahead=PARTITION_MONTHS_AHEAD):
+    """Garante as partições do mês atual até `months_ahead` meses à frente.
+
+    Linhas que caíram na partição padrão (por falta de partição para o mês)
+    são movidas para partições mensais próprias.
+    """
+    current = date.today().replace(day=1)
+    months = {add_months(current, offset) for offset in range(months_ahead + 1)}
+
+    cursor.execute(f"SELECT DISTINCT date_trunc('month', created_at)::date AS month FROM {table}_default")
+    stray_months = {row['month'] for row in cursor.fetchall()}
+
+    if not stray_months:
+        for month in sorted(months):
+            create_partition(cursor, table, month)
+        return
+
+    # Não é possível criar uma partição cujas linhas estão na partição padrão:
+    # desanexar a padrão, criar as partições e reinserir as linhas.
+    # DETACH e INSERT não disparam os triggers de exclusão (tombstones).
+    cursor.execute(f"ALTER TABLE {table} DETACH PARTITION {table}_default")
+    cursor.execute(f"ALTER TABLE {table}_default RENAME TO {table}_default_old")
+    for month in sorted(months | stray_months):
+        create_partition(cursor, table, month)
+    columns = ', '.join(PARTITIONED_TABLES[table])
+    cursor.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {table}_default_old")
+    cursor.execute(f"DROP TABLE {table}_default_old")
+    cursor.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+def ensure_all_partitions(months_ahead=PARTITION_MONTHS_AHEAD):
+    """Garante as partições futuras de todas as tabelas particionadas.
+
+    Usa um advisory lock para que workers rodando ao mesmo tempo não
+    executem o DDL em paralelo; quem não consegue o lock não faz nada.
+    Retorna False nesse caso.
+    """
+    with get_db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT pg_try_advisory_xact_lock(hashtext('ensure_partitions')) AS locked")
+        if not cursor.fetchone()['locked']:
+            cursor.close()
+            return False
+        for table in PARTITIONED_TABLES:
+            ensure_partitions(cursor, table, months_ahead)
+        cursor.close()
+    return True
+
+def migrate_to_partitioned(cursor, table, create_sql):
+    """Converte uma tabela comum já existente em tabela particionada.
+
+    A tabela antiga é renomeada, a nova é criada com `create_sql`, os dados
+    são copiados para as partições mensais e a tabela antiga é removida.
+    Nada é feito se a tabela já for particionada.
+    """
+    cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", (table,))
+    row = cursor.fetchone()
+    if not row or row['relkind'] != 'r':
+        return
+
+    cursor.execute(f"ALTER TABLE {table} RENAME TO {table}_unpartitioned")
+    cursor.execute(f"ALTER INDEX IF EXISTS {table}_pkey RENAME TO {table}_unpartitioned_pkey")
+    cursor.execute(create_sql)
+    cursor.execute(f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT")
+
+    # Uma partição para cada mês que já tem dados
+    cursor.execute(f"""
+        SELECT DISTINCT date_trunc('month', COALESCE(created_at, CURRENT_TIMESTAMP))::date AS month
+        FROM {table}_unpartitioned
+    """)
+    for row in cursor.fetchall():
+        create_partition(cursor, table, row['month'])
+
+    columns = PARTITIONED_TABLES[table]
+    select_columns = ', '.join(
+        'COALESCE(created_at, CURRENT_TIMESTAMP)' if column == 'created_at' else column
+        for column in columns
+    )
+    cursor.execute(f"""
+        INSERT INTO {table} ({', '.join(columns)})
+        SELECT {select_columns} FROM {table}_unpartitioned
+    """)
+    cursor.execute(f"DROP TABLE {table}_unpartitioned")
+
+def parse_datetime(value):
+    """Lê uma data ISO 8601, aceitando o sufixo "Z" (não suportado pelo
+    fromisoformat do Python 3.10).
+
+    As colunas são TIMESTAMP sem fuso (horário do servidor), então datas
+    com fuso são convertidas para o horário local e perdem o fuso: o
+    asyncpg recusa datas com fuso em parâmetros `timestamp`.
+    """
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+def parse_created_range(args):
+    """Lê os filtros opcionais `from` e `to` (ISO 8601) de uma listagem.
+
+    Retorna None sem filtros ou o intervalo [início, fim) em created_at,
+    que permite ao Postgres consultar apenas as partições do período.
+    Levanta ValueError para datas inválidas.
+    """
+    if not args.get('from') and not args.get('to'):
+        return None
+    start = parse_datetime(args['from']) if args.get('from') else datetime.min
+    end = parse_datetime(args['to']) if args.get('to') else datetime.max
+    return start, end
+
+def archive_partitions(retention_months=PARTITION_RETENTION_MONTHS, output_dir=PARTITION_ARCHIVE_DIR):
+    """Arquiva as partições mais antigas que a retenção.
+
+    Cada partição é desanexada, exportada para um CSV compactado em
+    `output_dir` e removida. A quantidade de cestas arquivada fica em
+    `archived_partitions`, para que o estoque continue correto.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    cutoff = add_months(date.today().replace(day=1), -retention_months)
+    archived = []
+
+    for table in PARTITIONED_TABLES:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT child.relname AS name
+                FROM pg_inherits
+                JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                WHERE parent.relname = %s
+                ORDER BY child.relname
+            """, (table,))
+            partitions = [row['name'] for row in cursor.fetchall()]
+            cursor.close()
+
+        for name in partitions:
+            try:
+                year, month = name[len(table) + 1:].split('_')
+                start = date(int(year), int(month), 1)
+            except ValueError:
+                # Partição padrão
+                continue
+            end = add_months(start, 1)
+            if end > cutoff:
+                continue
+
+            path = os.path.join(output_dir, f"{name}.csv.gz")
+
+            # Uma transação por partição: se a exportação falhar, nada é removido
+            with get_db_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f"SELECT COUNT(*) AS row_count, COALESCE(SUM(quantity), 0) AS quantity FROM {name}")
+                summary = cursor.fetchone()
+
+                cursor.execute(f"ALTER TABLE {table} DETACH PARTITION {name}")
+                with gzip.open(path, 'wt', encoding='utf-8') as archive_file:
+                    cursor.copy_expert(f"COPY {name} TO STDOUT WITH (FORMAT csv, HEADER)", archive_file)
+
+                cursor.execute("""
+                    INSERT INTO archived_partitions
+                        (table_name, partition_name, range_start, range_end, row_count, total_quantity, file_path)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s)
+                """, (table, name, start, end, summary['row_count'], summary['quantity'], path))
+                cursor.execute(f"DROP TABLE {name}")
+                cursor.close()
+
+            archived.append((name, summary['row_count'], path))
+
+    return archived
+
+@click.command('ensure-partitions')
+@click.option('--months-ahead', default=PARTITION_MONTHS_AHEAD, show_default=True,
+              help='Quantos meses à frente devem ter partição.')
+def ensure_partitions_command(months_ahead):
+    """Cria as partições mensais dos próximos meses."""
+    if ensure_all_partitions(months_ahead):
+        click.echo("✓ Partições criadas")
+    else:
+        click.echo("Outro processo está criando as partições")
+
+@click.command('archive-partitions')
+@click.option('--retention-months', default=PARTITION_RETENTION_MONTHS, show_default=True,
+              help='Meses de histórico mantidos no banco.')
+@click.option('--output-dir', default=PARTITION_ARCHIVE_DIR, show_default=True,
+              help='Diretório dos arquivos compactados.')
+def archive_partitions_command(retention_months, output_dir):
+    """Arquiva em disco as partições mais antigas que a retenção."""
+    archived = archive_partitions(retention_months, output_dir)
+    for name, rows, path in archived:
+        click.echo(f"✓ {name}: {rows} registros em {path}")
+    if not archived:
+        click.echo("Nenhuma partição para arquivar")
@@ -0,0 +1,485 @@
+import threading
+import time
+from psycopg2 import errors
+
+# Consultas da aplicação, declaradas uma única vez.
+# Os parâmetros usam a sintaxe do Postgres ($1, $2, ...): no modo síncrono
+# viram PREPARE/EXECUTE; no modo assíncrono o asyncpg já prepara e guarda
+# cada texto por conexão.
+QUERIES = {
+    # Usuários
+    'user_by_username': """
+        SELECT id, username, password_hash FROM users WHERE username = $1
+    """,
+
+    # Famílias
+    'family_list': """
+        SELECT id, name, father_name, mother_name, number_of_children,
+               is_employed, receives_government_aid, government_aid_type,
+               has_critical_factor, critical_factor_notes, created_at, updated_at
+        FROM families
+        ORDER BY created_at DESC
+    """,
+    'family_by_id': """
+        SELECT id, name, father_name, mother_name, number_of_children,
+               is_employed, receives_government_aid, government_aid_type,
+               has_critical_factor, critical_factor_notes, created_at, updated_at
+        FROM families
+        WHERE id = $1
+    """,
+    'families_by_ids': """
+        SELECT id, name, father_name, mother_name, number_of_children,
+               is_employed, receives_government_aid, government_aid_type,
+               has_critical_factor, critical_factor_notes, created_at, updated_at
+        FROM families
+        WHERE id = ANY($1::text[]::uuid[])
+    """,
+    'family_ids': """
+        SELECT id FROM families ORDER BY created_at
+    """,
+    'family_insert': """
+        INSERT INTO families (
+            name, father_name, mother_name, number_of_children,
+            is_employed, receives_government_aid, government_aid_type,
+            has_critical_factor, critical_factor_notes
+        )
+        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
+        RETURNING id, created_at, updated_at
+    """,
+    'family_update': """
+        UPDATE families
+        SET name = $1, father_name = $2, mother_name = $3,
+            number_of_children = $4, is_employed = $5,
+            receives_government_aid = $6, government_aid_type = $7,
+            has_critical_factor = $8, critical_factor_notes = $9,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE id = $10
+        RETURNING updated_at
+    """,
+    'family_delete': """
+        DELETE FROM families WHERE id = $1 RETURNING id
+    """,
+    'family_lock': """
+        SELECT id FROM families WHERE id = $1 FOR UPDATE
+    """,
+    'distribution_ids_by_family': """
+        SELECT id FROM distributions WHERE family_id = $1
+    """,
+    'families_count': """
+        SELECT COUNT(*) as total FROM families
+    """,
+
+    # Filhos
+    'children_by_family': """
+        SELECT id, name, age FROM children WHERE family_id = $1
+    """,
+    'children_by_families': """
+        SELECT id, family_id, name, age FROM children WHERE family_id = ANY($1::text[]::uuid[])
+    """,
+    'child_insert': """
+        INSERT INTO children (family_id, name, age)
+        VALUES ($1, $2, $3)
+        RETURNING id, name, age
+    """,
+    'children_delete': """
+        DELETE FROM children WHERE family_id = $1
+    """,
+
+    # Doações (particionadas por mês: filtros em created_at descartam as
+    # partições fora do intervalo; os totais somam as partições arquivadas)
+    'donation_list': """
+        SELECT id, responsible_name, cpf, phone, quantity, type, created_at
+        FROM donations
+        ORDER BY created_at DESC
+    """,
+    'donation_insert': """
+        INSERT INTO donations (responsible_name, cpf, phone, quantity, type)
+        VALUES ($1, $2, $3, $4, $5)
+        RETURNING id, created_at
+    """,
+    'donation_list_between': """
+        SELECT id, responsible_name, cpf, phone, quantity, type, created_at
+        FROM donations
+        WHERE created_at >= $1 AND created_at < $2
+        ORDER BY created_at DESC
+    """,
+    'donations_count': """
+        SELECT COUNT(*) as total FROM donations
+    """,
+    'donations_total': """
+        SELECT (
+            (SELECT COALESCE(SUM(quantity), 0) FROM donations)
+            + (SELECT COALESCE(SUM(total_quantity), 0) FROM archived_partitions WHERE table_name = 'donations')
+        )::bigint as total
+    """,
+
+    # Distribuições
+    'distribution_list': """
+        SELECT id, family_id, family_name, pickup_person_name, quantity, date, created_at
+        FROM distributions
+        ORDER BY created_at DESC
+    """,
+    'distribution_insert': """
+        INSERT INTO distributions (family_id, family_name, pickup_person_name, quantity, date)
+        VALUES ($1, $2, $3, $4, $5::timestamptz)
+        RETURNING id, created_at
+    """,
+    'distribution_list_between': """
+        SELECT id, family_id, family_name, pickup_person_name, quantity, date, created_at
+        FROM distributions
+        WHERE created_at >= $1 AND created_at < $2
+        ORDER BY created_at DESC
+    """,
+    'distributions_count': """
+        SELECT COUNT(*) as total FROM distributions
+    """,
+    'distributions_total': """
+        SELECT (
+            (SELECT COALESCE(SUM(quantity), 0) FROM distributions)
+            + (SELECT COALESCE(SUM(total_quantity), 0) FROM archived_partitions WHERE table_name = 'distributions')
+        )::bigint as total
+    """,
+    'distributions_recent': """
+        SELECT id, family_name, pickup_person_name, quantity, date, created_at
+        FROM distributions
+        ORDER BY created_at DESC
+        LIMIT 5
+    """,
+    'distributions_created_since': """
+        SELECT id, family_id, family_name, pickup_person_name, quantity, date, created_at
+        FROM distributions
+        WHERE created_at >= $1
+        ORDER BY created_at
+        LIMIT $2
+    """,
+
+    # Sincronização incremental
+    'sync_token': """
+        SELECT LEAST(CURRENT_TIMESTAMP, COALESCE(MIN(xact_start), CURRENT_TIMESTAMP))::timestamp AS token
+        FROM pg_stat_activity
+        WHERE datname = current_database() AND backend_type = 'client backend' AND xact_start IS NOT NULL
+    """,
+    'sync_families_all': """
+        SELECT id, name, father_name, mother_name, number_of_children,
+               is_employed, receives_government_aid, government_aid_type,
+               has_critical_factor, critical_factor_notes, created_at, updated_at
+        FROM families
+        ORDER BY updated_at
+    """,
+    'sync_families_since': """
+        SELECT id, name, father_name, mother_name, number_of_children,
+               is_employed, receives_government_aid, government_aid_type,
+               has_critical_factor, critical_factor_notes, created_at, updated_at
+        FROM families
+        WHERE updated_at >= $1
+        ORDER BY updated_at
+    """,
+    'sync_donations_all': """
+        SELECT id, responsible_name, cpf, phone, quantity, type, created_at
+        FROM donations
+        ORDER BY updated_at
+    """,
+    'sync_donations_since': """
+        SELECT id, responsible_name, cpf, phone, quantity, type, created_at
+        FROM donations
+        WHERE updated_at >= $1
+        ORDER BY updated_at
+    """,
+    'sync_distributions_all': """
+        SELECT id, family_id, family_name, pickup_person_name, quantity, date, created_at
+        FROM distributions
+        ORDER BY updated_at
+    """,
+    'sync_distributions_since': """
+        SELECT id, family_id, family_name, pickup_person_name, quantity, date, created_at
+        FROM distributions
+        WHERE updated_at >= $1
+        ORDER BY updated_at
+    """,
+    # Exportação em lotes pela chave primária (uma transação curta por lote)
+    'export_families_page': """
+        SELECT id, name, father_name, mother_name, number_of_children,
+               is_employed, receives_government_aid, government_aid_type,
+               has_critical_factor, critical_factor_notes, created_at, updated_at
+        FROM families
+        WHERE id > $1
+        ORDER BY id
+        LIMIT $2
+    """,
+    'export_donations_page': """
+        SELECT id, responsible_name, cpf, phone, quantity, type, created_at
+        FROM donations
+        WHERE id > $1
+        ORDER BY id
+        LIMIT $2
+    """,
+    'export_distributions_page': """
+        SELECT id, family_id, family_name, pickup_person_name, quantity, date, created_at
+        FROM distributions
+        WHERE id > $1
+        ORDER BY id
+        LIMIT $2
+    """,
+    'sync_tombstones_since': """
+        SELECT table_name, record_id FROM tombstones WHERE deleted_at >= $1
+    """,
+    'tombstones_prune': """
+        DELETE FROM tombstones WHERE deleted_at < CURRENT_TIMESTAMP - make_interval(days => $1)
+    """,
+
+    # Relatórios (filtros em created_at consultam só as partições do ano)
+    'report_donations_by_month': """
+        SELECT date_trunc('month', created_at)::date AS month, SUM(quantity)::bigint AS total
+        FROM donations
+        WHERE created_at >= $1 AND created_at < $2
+        GROUP BY 1
+    """,
+    'report_distributions_by_month': """
+        SELECT date_trunc('month', created_at)::date AS month, SUM(quantity)::bigint AS total,
+               COUNT(DISTINCT family_id) AS families
+        FROM distributions
+        WHERE created_at >= $1 AND created_at < $2
+        GROUP BY 1
+    """,
+
+    # Fila de jobs
+    'job_insert': """
+        INSERT INTO jobs (type, params, max_attempts, created_by)
+        VALUES ($1, $2::jsonb, $3, $4)
+        RETURNING id, type, status, progress, attempts, max_attempts, result_path, error,
+                  created_at, started_at, finished_at
+    """,
+    'job_by_id': """
+        SELECT id, type, status, progress, attempts, max_attempts, result_path, error,
+               created_at, started_at, finished_at
+        FROM jobs
+        WHERE id = $1 AND created_by = $2
+    """,
+    'jobs_by_user': """
+        SELECT id, type, status, progress, attempts, max_attempts, result_path, error,
+               created_at, started_at, finished_at
+        FROM jobs
+        WHERE created_by = $1
+        ORDER BY created_at DESC
+        LIMIT 50
+    """,
+    'jobs_claim_lock': """
+        SELECT pg_advisory_xact_lock(hashtext('jobs_claim'))
+    """,
+    'jobs_running_by_type': """
+        SELECT type, COUNT(*) AS running FROM jobs WHERE status = 'running' GROUP BY type
+    """,
+    'job_claim': """
+        UPDATE jobs
+        SET status = 'running', attempts = attempts + 1, progress = 0, error = NULL,
+            started_at = CURRENT_TIMESTAMP, heartbeat_at = CURRENT_TIMESTAMP
+        WHERE id = (
+            SELECT id FROM jobs
+            WHERE status = 'queued' AND run_after <= CURRENT_TIMESTAMP AND type = ANY($1::text[])
+            ORDER BY run_after
+            FOR UPDATE SKIP LOCKED
+            LIMIT 1
+        )
+        RETURNING id, type, params, attempts, max_attempts, created_by
+    """,
+    'job_progress': """
+        UPDATE jobs SET progress = $2, heartbeat_at = CURRENT_TIMESTAMP WHERE id = $1
+    """,
+    'jobs_heartbeat': """
+        UPDATE jobs SET heartbeat_at = CURRENT_TIMESTAMP
+        WHERE id = ANY($1::text[]::uuid[]) AND status = 'running'
+    """,
+    'job_succeeded': """
+        UPDATE jobs
+        SET status = 'succeeded', progress = 100, result_path = $2, finished_at = CURRENT_TIMESTAMP
+        WHERE id = $1
+    """,
+    'job_failed': """
+        UPDATE jobs
+        SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'queued' END,
+            run_after = CURRENT_TIMESTAMP + make_interval(secs => $3 * power(2, attempts - 1)),
+            finished_at = CASE WHEN attempts >= max_attempts THEN CURRENT_TIMESTAMP END,
+            error = $2
+        WHERE id = $1
+        RETURNING status
+    """,
+    'jobs_requeue_stale': """
+        UPDATE jobs
+        SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'queued' END,
+            run_after = CURRENT_TIMESTAMP,
+            finished_at = CASE WHEN attempts >= max_attempts THEN CURRENT_TIMESTAMP END,
+            error = 'Worker interrompido durante a execução'
+        WHERE status = 'running' AND heartbeat_at < CURRENT_TIMESTAMP - make_interval(secs => $1)
+        RETURNING id
+    """,
+
+    # Detecção de duplicatas
+    'dedupe_lock': """
+        SELECT pg_advisory_xact_lock(hashtext('dedupe'))
+    """,
+    'family_blocks_delete': """
+        DELETE FROM family_blocks WHERE family_id = ANY($1::text[]::uuid[])
+    """,
+    'family_blocks_insert': """
+        INSERT INTO family_blocks (key, family_id)
+        SELECT key, family_id::uuid FROM unnest($1::text[], $2::text[]) AS block(key, family_id)
+        ON CONFLICT DO NOTHING
+    """,
+    'family_block_candidates': """
+        WITH probe AS (
+            SELECT key, family_id::uuid AS family_id
+            FROM unnest($1::text[], $2::text[]) AS probe(key, family_id)
+        ),
+        small_blocks AS (
+            -- Conta no máximo $3 + 1 linhas por bloco: blocos grandes são ignorados
+            SELECT DISTINCT key FROM probe
+            WHERE (
+                SELECT COUNT(*) FROM (
+                    SELECT 1 FROM family_blocks WHERE family_blocks.key = probe.key LIMIT $3 + 1
+                ) capped
+            ) <= $3
+        ),
+        shared AS (
+            SELECT probe.family_id, block.family_id AS candidate_id, COUNT(*) AS shared_keys
+            FROM probe
+            JOIN small_blocks ON small_blocks.key = probe.key
+            JOIN family_blocks block ON block.key = probe.key AND block.family_id <> probe.family_id
+            GROUP BY 1, 2
+        )
+        SELECT family_id, candidate_id
+        FROM (
+            SELECT family_id, candidate_id,
+                   ROW_NUMBER() OVER (PARTITION BY family_id ORDER BY shared_keys DESC) AS position
+            FROM shared
+        ) ranked
+        WHERE position <= $4
+    """,
+    'duplicate_upsert': """
+        INSERT INTO duplicate_candidates (family_id, duplicate_id, score, reasons)
+        SELECT family_id::uuid, duplicate_id::uuid, score, reasons::jsonb
+        FROM unnest($1::text[], $2::text[], $3::real[], $4::text[]) AS found(family_id, duplicate_id, score, reasons)
+        ON CONFLICT (family_id, duplicate_id) DO UPDATE
+        SET score = EXCLUDED.score, reasons = EXCLUDED.reasons, updated_at = CURRENT_TIMESTAMP
+        WHERE duplicate_candidates.status = 'pending'
+    """,
+    'duplicates_by_status': """
+        SELECT d.id, d.score, d.reasons, d.status, d.created_at, d.reviewed_at,
+               f.id AS family_id, f.name AS family_name,
+               f.father_name AS family_father_name, f.mother_name AS family_mother_name,
+               o.id AS duplicate_id, o.name AS duplicate_name,
+               o.father_name AS duplicate_father_name, o.mother_name AS duplicate_mother_name
+        FROM duplicate_candidates d
+        JOIN families f ON f.id = d.family_id
+        JOIN families o ON o.id = d.duplicate_id
+        WHERE d.status = $1
+        ORDER BY d.score DESC, d.created_at
+        LIMIT $2
+    """,
+    'duplicate_review': """
+        UPDATE duplicate_candidates
+        SET status = $2, reviewed_by = $3, reviewed_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+        WHERE id = $1
+        RETURNING id, status
+    """,
+
+    # Auditoria (paginação por id: $1 é o último id da página anterior)
+    'audit_recent': """
+        SELECT id, occurred_at, user_id, username, action, entity_type, entity_id, details
+        FROM audit_log
+        WHERE id < $1 AND occurred_at >= $2
+        ORDER BY id DESC
+        LIMIT $3
+    """,
+    'audit_by_entity': """
+        SELECT id, occurred_at, user_id, username, action, entity_type, entity_id, details
+        FROM audit_log
+        WHERE entity_type = $4 AND entity_id = $5 AND id < $1 AND occurred_at >= $2
+        ORDER BY id DESC
+        LIMIT $3
+    """,
+    'audit_by_user': """
+        SELECT id, occurred_at, user_id, username, action, entity_type, entity_id, details
+        FROM audit_log
+        WHERE user_id = $4 AND id < $1 AND occurred_at >= $2
+        ORDER BY id DESC
+        LIMIT $3
+    """,
+
+    # Eventos do dashboard
+    'notify_change': """
+        SELECT pg_notify($1, $2)
+    """,
+}
+
+# Contadores por consulta (por processo): quantas vezes foi preparada e
+# executada, e o tempo gasto em cada etapa
+_stats = {}
+_stats_lock = threading.Lock()
+
+def _record(name, counter, timer, elapsed):
+    with _stats_lock:
+        stats = _stats.setdefault(name, {
+            'prepares': 0, 'prepareTime': 0.0,
+            'executions': 0, 'executeTime': 0.0
+        })
+        stats[counter] += 1
+        stats[timer] += elapsed
+
+def execute(cursor, name, params=()):
+    """Executa a consulta registrada `name`, preparando-a na conexão se necessário.
+
+    Cada conexão do pool guarda os nomes que já preparou; conexões novas
+    (inclusive após uma reconexão) começam vazias e preparam de novo.
+    """
+    conn = cursor.connection
+    if name not in conn.prepared_statements:
+        start = time.perf_counter()
+        cursor.execute(f"PREPARE {name} AS {QUERIES[name]}")
+        _record(name, 'prepares', 'prepareTime', time.perf_counter() - start)
+        conn.prepared_statements.add(name)
+
+    if params:
+        sql = f"EXECUTE {name} ({', '.join(['%s'] * len(params))})"
+    else:
+        sql = f"EXECUTE {name}"
+
+    start = time.perf_counter()
+    try:
+        cursor.execute(sql, params)
+    except errors.InvalidSqlStatementName:
+        # O servidor descartou os prepared statements (ex.: DISCARD ALL):
+        # a transação atual falha, mas a próxima prepara tudo de novo
+        conn.prepared_statements.clear()
+        raise
+    _record(name, 'executions', 'executeTime', time.perf_counter() - start)
+
+def get_stats(cursor=None):
+    """Retorna os contadores de cada consulta deste processo.
+
+    O PREPARE só faz a análise da consulta; o planejamento acontece no
+    EXECUTE (as primeiras execuções usam planos específicos para os
+    parâmetros e depois o Postgres pode passar a reaproveitar um plano
+    genérico). Com `cursor`, inclui quantos planos genéricos e específicos
+    cada consulta já usou na conexão do cursor (pg_prepared_statements,
+    Postgres 14+).
+    """
+    with _stats_lock:
+        snapshot = {name: dict(stats) for name, stats in _stats.items()}
+
+    plans = {}
+    if cursor is not None and cursor.connection.server_version >= 140000:
+        cursor.execute("SELECT name, generic_plans, custom_plans FROM pg_prepared_statements")
+        plans = {row['name']: row for row in cursor.fetchall()}
+
+    result = {}
+    for name, stats in sorted(snapshot.items()):
+        result[name] = {
+            'prepares': stats['prepares'],
+            'executions': stats['executions'],
+            'reusedExecutions': max(stats['executions'] - stats['prepares'], 0),
+            'avgPrepareMs': round(stats['prepareTime'] / stats['prepares'] * 1000, 3) if stats['prepares'] else 0.0,
+            'avgExecuteMs': round(stats['executeTime'] / stats['executions'] * 1000, 3) if stats['executions'] else 0.0,
+            'genericPlans': plans[name]['generic_plans'] if name in plans else None,
+            'customPlans': plans[name]['custom_plans'] if name in plans else None
+        }
+    return result
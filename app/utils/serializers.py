@@ -0,0 +1,98 @@
+def serialize_child(child):
+    """Converte um registro de filho para o formato da API."""
+    return {
+        'id': str(child['id']),
+        'name': child['name'],
+        'age': child['age']
+    }
+
+def serialize_family(family, children):
+    """Converte um registro de família (e seus filhos) para o formato da API."""
+    return {
+        'id': str(family['id']),
+        'name': family['name'],
+        'fatherName': family['father_name'],
+        'motherName': family['mother_name'],
+        'numberOfChildren': family['number_of_children'],
+        'children': [serialize_child(child) for child in children],
+        'isEmployed': family['is_employed'],
+        'receivesGovernmentAid': family['receives_government_aid'],
+        'governmentAidType': family['government_aid_type'],
+        'hasCriticalFactor': family['has_critical_factor'],
+        'criticalFactorNotes': family['critical_factor_notes'],
+        'createdAt': family['created_at'].isoformat(),
+        'updatedAt': family['updated_at'].isoformat()
+    }
+
+def serialize_donation(donation):
+    """Converte um registro de doação para o formato da API."""
+    return {
+        'id': str(donation['id']),
+        'responsibleName': donation['responsible_name'],
+        'cpf': donation['cpf'],
+        'phone': donation['phone'],
+        'quantity': donation['quantity'],
+        'type': donation['type'],
+        'createdAt': donation['created_at'].isoformat()
+    }
+
+def serialize_distribution(distribution):
+    """Converte um registro de distribuição para o formato da API."""
+    return {
+        'id': str(distribution['id']),
+        'familyId': str(distribution['family_id']),
+        'familyName': distribution['family_name'],
+        'pickupPersonName': distribution['pickup_person_name'],
+        'quantity': distribution['quantity'],
+        'date': distribution['date'].isoformat(),
+        'createdAt': distribution['created_at'].isoformat()
+    }
+
+def serialize_job(job):
+    """Converte um registro de job para o formato da API."""
+    return {
+        'id': str(job['id']),
+        'type': job['type'],
+        'status': job['status'],
+        'progress': job['progress'],
+        'attempts': job['attempts'],
+        'maxAttempts': job['max_attempts'],
+        'hasResult': job['result_path'] is not None,
+        'error': job['error'],
+        'createdAt': job['created_at'].isoformat(),
+        'startedAt': job['started_at'].isoformat() if job['started_at'] else None,
+        'finishedAt': job['finished_at'].isoformat() if job['finished_at'] else None
+    }
+
+def serialize_audit(entry):
+    """Converte um registro da trilha de auditoria para o formato da API."""
+    return {
+        'id': entry['id'],
+        'occurredAt': entry['occurred_at'].isoformat(),
+        'userId': str(entry['user_id']) if entry['user_id'] else None,
+        'username': entry['username'],
+        'action': entry['action'],
+        'entityType': entry['entity_type'],
+        'entityId': str(entry['entity_id']) if entry['entity_id'] else None,
+        'details': entry['details']
+    }
+
+def serialize_duplicate(duplicate):
+    """Converte um par de possíveis duplicatas para o formato da API."""
+    def family(prefix):
+        return {
+            'id': str(duplicate[f'{prefix}_id']),
+            'name': duplicate[f'{prefix}_name'],
+            'fatherName': duplicate[f'{prefix}_father_name'],
+            'motherName': duplicate[f'{prefix}_mother_name']
+        }
+    return {
+        'id': str(duplicate['id']),
+        'score': round(duplicate['score'], 3),
+        'reasons': duplicate['reasons'],
+        'status': duplicate['status'],
+        'family': family('family'),
+        'duplicate': family('duplicate'),
+        'createdAt': duplicate['created_at'].isoformat(),
+        'reviewedAt': duplicate['reviewed_at'].isoformat() if duplicate['reviewed_at'] else None
+    }
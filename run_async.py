@@ -0,0 +1,19 @@
+from app.aio import create_async_app
+from app.utils.database import init_db
+import os
+
+# Criar aplicação assíncrona (ASGI)
+app = create_async_app()
+
+# Inicializar banco de dados
+try:
+    init_db()
+    print("✓ Banco de dados inicializado com sucesso!")
+except Exception as e:
+    print(f"✗ Erro ao inicializar banco de dados: {e}")
+
+if __name__ == '__main__':
+    import uvicorn
+
+    port = int(os.getenv('PORT', 5000))
+    uvicorn.run(app, host='0.0.0.0', port=port)
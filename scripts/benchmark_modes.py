@@ -0,0 +1,89 @@
+"""Compara o modo síncrono (gunicorn) com o modo assíncrono (uvicorn).
+
+Suba os dois servidores apontando para o mesmo banco, por exemplo:
+
+    gunicorn -w 4 -k gthread --threads 32 -b 0.0.0.0:5000 "app:create_app()"
+    uvicorn run_async:app --port 8000
+
+e execute:
+
+    python scripts/benchmark_modes.py --sync http://localhost:5000 --async http://localhost:8000
+"""
+import argparse
+import json
+import statistics
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+def login(base_url, username, password):
+    """Faz login e devolve o token JWT."""
+    body = json.dumps({'username': username, 'password': password}).encode('utf-8')
+    req = urllib.request.Request(
+        f"{base_url}/api/auth/login",
+        data=body,
+        headers={'Content-Type': 'application/json'}
+    )
+    with urllib.request.urlopen(req) as response:
+        return json.loads(response.read())['token']
+
+def timed_request(url, token):
+    """Executa uma requisição e devolve (latência em segundos, sucesso)."""
+    req = urllib.request.Request(url, headers={'Authorization': f'Bearer {token}'})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=60) as response:
+            response.read()
+            ok = response.status == 200
+    except Exception:
+        ok = False
+    return time.perf_counter() - start, ok
+
+def run(name, base_url, args):
+    token = login(base_url, args.username, args.password)
+    url = f"{base_url}{args.path}"
+
+    # Aquecimento: abrir conexões do pool e carregar o código
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        list(executor.map(lambda _: timed_request(url, token), range(args.concurrency)))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        results = list(executor.map(lambda _: timed_request(url, token), range(args.requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for latency, ok in results if ok)
+    errors = sum(1 for _, ok in results if not ok)
+    if not latencies:
+        print(f"{name:<6} todas as {errors} requisições falharam")
+        return
+
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+
+    print(
+        f"{name:<6} {len(results) / elapsed:8.1f} req/s  "
+        f"média {statistics.mean(latencies) * 1000:7.1f} ms  "
+        f"p50 {percentile(0.50):7.1f} ms  p95 {percentile(0.95):7.1f} ms  "
+        f"p99 {percentile(0.99):7.1f} ms  erros {errors}"
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sync', dest='sync_url', help='URL base do servidor síncrono')
+    parser.add_argument('--async', dest='async_url', help='URL base do servidor assíncrono')
+    parser.add_argument('--path', default='/api/dashboard/stats', help='Rota a ser medida')
+    parser.add_argument('--requests', type=int, default=2000, help='Total de requisições por modo')
+    parser.add_argument('--concurrency', type=int, default=200, help='Requisições simultâneas')
+    parser.add_argument('--username', default='admin')
+    parser.add_argument('--password', default='admin123')
+    args = parser.parse_args()
+
+    print(f"{args.requests} requisições a {args.path} com concorrência {args.concurrency}")
+    if args.sync_url:
+        run('sync', args.sync_url, args)
+    if args.async_url:
+        run('async', args.async_url, args)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,11 @@
+import time
+import pytest
+
+@pytest.fixture
+def sao_paulo(monkeypatch):
+    """Fuso do processo fixo em America/Sao_Paulo (UTC-3) durante o teste."""
+    monkeypatch.setenv('TZ', 'America/Sao_Paulo')
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
@@ -0,0 +1,30 @@
+import uuid
+from datetime import datetime
+import pytest
+from app.utils.audit import parse_audit_filters, audit_fields, AUDIT_FIRST_PAGE
+
+def test_defaults():
+    assert parse_audit_filters({}) == ('audit_recent', (AUDIT_FIRST_PAGE, datetime.min, 50), 50)
+
+def test_since_with_timezone_is_naive(sao_paulo):
+    name, params, limit = parse_audit_filters({'since': '2024-01-01T12:00:00Z'})
+    assert params[1] == datetime(2024, 1, 1, 9, 0)
+    assert params[1].tzinfo is None
+
+@pytest.mark.parametrize('limit', ['0', '501', '-1'])
+def test_limit_out_of_range(limit):
+    with pytest.raises(ValueError):
+        parse_audit_filters({'limit': limit})
+
+def test_entity_filter_requires_type():
+    entity_id = str(uuid.uuid4())
+    with pytest.raises(ValueError):
+        parse_audit_filters({'entityId': entity_id})
+    name, params, limit = parse_audit_filters({'entityId': entity_id, 'entityType': 'family'})
+    assert name == 'audit_by_entity'
+    assert params[-2:] == ('family', entity_id)
+
+def test_audit_fields_keeps_only_field_names():
+    data = {'responsibleName': 'Maria', 'cpf': '123.456.789-00', 'phone': '1199999', 'quantity': 2}
+    assert audit_fields(data) == {'fields': ['cpf', 'phone', 'quantity', 'responsibleName']}
+    assert audit_fields(None) == {'fields': []}
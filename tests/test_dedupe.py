@@ -0,0 +1,59 @@
+from app.utils.dedupe import fold, phonetic, tokens, blocking_keys, score_pair, is_candidate
+
+def family(name, father_name=None, mother_name=None):
+    return {'name': name, 'father_name': father_name, 'mother_name': mother_name}
+
+def test_fold_removes_accents_and_punctuation():
+    assert fold('Gonçalves') == 'goncalves'
+    assert fold('Lourenço') == 'lourenco'
+    assert fold('José-Antônio') == 'jose antonio'
+    assert fold(None) == ''
+
+def test_tokens_drop_stopwords_and_single_letters():
+    assert tokens('Família da Silva e Souza') == ['silva', 'souza']
+    assert tokens('J. P. Oliveira dos Santos') == ['oliveira', 'santos']
+    assert tokens(None) == []
+
+def test_phonetic_matches_common_spelling_variants():
+    pairs = [
+        ('Gonçalves', 'Goncalves'),
+        ('Lourenço', 'Lourenco'),
+        ('Souza', 'Sousa'),
+        ('Thiago', 'Tiago'),
+        ('Raphael', 'Rafael'),
+        ('Conceição', 'Conceicao'),
+        ('Anna', 'Ana'),
+    ]
+    for a, b in pairs:
+        assert phonetic(fold(a)) == phonetic(fold(b)), (a, b)
+
+def test_phonetic_keeps_hard_and_soft_g_apart():
+    assert phonetic('guilherme') == 'gilerme'
+    assert phonetic('gilberto') == 'jilberto'
+
+def test_blocking_keys_shared_without_accents():
+    with_accent = blocking_keys(family('Família Gonçalves', mother_name='Maria Lourenço'), [])
+    without_accent = blocking_keys(family('Familia Goncalves', mother_name='Maria Lourenco'), [])
+    assert 'a:goncalves' in with_accent
+    assert with_accent == without_accent
+
+def test_score_pair_matches_same_family_with_typos():
+    a = family('Família Souza', 'José de Souza', 'Maria Conceição')
+    b = family('Familia Sousa', 'Jose Sousa', 'Maria Conceicao')
+    children_a = [{'name': 'Thiago', 'age': 7}, {'name': 'Ana', 'age': 3}]
+    children_b = [{'name': 'Tiago', 'age': 8}, {'name': 'Anna', 'age': 3}]
+    score, reasons = score_pair(a, children_a, b, children_b)
+    assert score >= 0.9
+    assert reasons['children'] == 1.0
+    assert is_candidate(score, reasons)
+
+def test_score_pair_name_only_is_not_a_candidate():
+    score, reasons = score_pair(family('Família Silva'), [], family('Silva'), [])
+    assert score == 1.0
+    assert not is_candidate(score, reasons)
+
+def test_score_pair_different_families():
+    a = family('Família Souza', 'José de Souza', 'Maria Conceição')
+    b = family('Família Oliveira', 'Pedro Oliveira', 'Ana Lima')
+    score, reasons = score_pair(a, [], b, [])
+    assert not is_candidate(score, reasons)
@@ -0,0 +1,26 @@
+from datetime import datetime
+import pytest
+from app.utils.partitions import parse_datetime, parse_created_range
+
+def test_parse_datetime_converts_utc_suffix_to_local_naive(sao_paulo):
+    parsed = parse_datetime('2024-01-01T12:00:00Z')
+    assert parsed == datetime(2024, 1, 1, 9, 0)
+    assert parsed.tzinfo is None
+
+def test_parse_datetime_converts_offset_to_local_naive(sao_paulo):
+    parsed = parse_datetime('2024-01-01T12:00:00+01:00')
+    assert parsed == datetime(2024, 1, 1, 8, 0)
+    assert parsed.tzinfo is None
+
+def test_parse_datetime_keeps_naive_dates(sao_paulo):
+    assert parse_datetime('2024-01-01T12:00:00') == datetime(2024, 1, 1, 12, 0)
+    assert parse_datetime('2024-01-01') == datetime(2024, 1, 1)
+
+def test_parse_datetime_rejects_invalid_dates():
+    with pytest.raises(ValueError):
+        parse_datetime('01/01/2024')
+
+def test_parse_created_range(sao_paulo):
+    assert parse_created_range({}) is None
+    assert parse_created_range({'from': '2024-01-01T03:00:00Z'}) == (datetime(2024, 1, 1), datetime.max)
+    assert parse_created_range({'to': '2024-02-01'}) == (datetime.min, datetime(2024, 2, 1))
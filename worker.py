@@ -0,0 +1,12 @@
+from app.jobs.runner import JobRunner
+from app.utils.database import init_db
+
+# Inicializar banco de dados
+try:
+    init_db()
+    print("✓ Banco de dados inicializado com sucesso!")
+except Exception as e:
+    print(f"✗ Erro ao inicializar banco de dados: {e}")
+
+if __name__ == '__main__':
+    JobRunner().run()